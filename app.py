@@ -3,12 +3,19 @@ import streamlit as st
 st.set_page_config(page_title="FinanceCompare Pro", layout="wide", page_icon="📊")
 
 # 📦 Librerías
-import yfinance as yf
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-from deep_translator import GoogleTranslator
+from financecompare.analytics import CAGR_HORIZONS, load_price_window
+from financecompare.concurrency import submit_fetch
+from financecompare.framecache import default_frame_cache
+from financecompare.info import get_company_info
+from financecompare.metrics import (DerivedSeries, compute_cagr_horizons, compute_metrics, cumulative_frame,
+                                    rolling_volatility)
+from financecompare.prefetch import start_default_scheduler
+from financecompare.prices import slice_price_window
+from financecompare.session import http_stats, recent_http_calls
+from financecompare.throttle import throttle_stats
+from financecompare.translation import translate_description_async
 
 # 🎨 Estilo profesional con tema claro
 st.markdown("""
@@ -91,14 +98,6 @@ st.markdown("""
             margin-bottom: 15px;
         }
         
-        .ticker-color-1 {
-            color: #1f77b4;
-        }
-        
-        .ticker-color-2 {
-            color: #ff7f0e;
-        }
-        
         .formula-box {
             background-color: #f0f5ff;
             border-left: 4px solid #1f77b4;
@@ -118,131 +117,111 @@ with col2:
     st.title("FinanceCompare Pro")
 st.markdown("**Plataforma profesional de análisis y comparación de activos financieros**")
 
-# 🔎 Función para obtener info de empresa mejorada
-def get_company_info(symbol):
-    try:
-        stock = yf.Ticker(symbol)
-        info = stock.info
-        company_name = info.get("shortName", info.get("longName", symbol))
-        sector = info.get("sector", "Sector no disponible")
-        industry = info.get("industry", "Industria no disponible")
-        country = info.get("country", "País no disponible")
-        description = info.get("longBusinessSummary", "Descripción no disponible.")
-        
-        # Traducción al español
-        try:
-            description = GoogleTranslator(source='auto', target='es').translate(description[:2000])
-        except:
-            pass
-            
-        # Datos adicionales
-        market_cap = info.get("marketCap", "N/A")
-        if isinstance(market_cap, (int, float)):
-            if market_cap >= 1e12:
-                market_cap = f"${market_cap/1e12:.2f}T"
-            elif market_cap >= 1e9:
-                market_cap = f"${market_cap/1e9:.2f}B"
-            elif market_cap >= 1e6:
-                market_cap = f"${market_cap/1e6:.2f}M"
-        
-        return {
-            "symbol": symbol,
-            "name": company_name,
-            "sector": sector,
-            "industry": industry,
-            "country": country,
-            "description": description,
-            "market_cap": market_cap,
-            "currency": info.get("currency", "N/A")
-        }
-    except Exception as e:
-        return {"error": f"Error al obtener datos: {str(e)}"}
+# ⚡ Caché de Streamlit para cálculos y gráficos: mismas entradas, resultado inmediato
+# (los precios usan la caché en memoria con presupuesto de bytes de financecompare.framecache
+# y get_company_info su propia caché con revalidación en segundo plano)
+COMPUTE_CACHE_ENTRIES = 64
+FIGURE_CACHE_ENTRIES = 32
+
+# Los parámetros con "_" no entran en la clave de la caché: el DerivedSeries depende solo de los precios
+@st.cache_data(max_entries=COMPUTE_CACHE_ENTRIES, show_spinner=False)
+def compute_metrics_cached(prices, years, _derived=None):
+    return compute_metrics(prices, years, derived=_derived)
 
-# 📉 Función para obtener precios históricos mejorada
-def get_historical_prices(symbol, years):
+compute_cagr_horizons_cached = st.cache_data(max_entries=COMPUTE_CACHE_ENTRIES, show_spinner=False)(compute_cagr_horizons)
+
+# ⏰ Pre-calentado de la lista de seguimiento (FINANCECOMPARE_WATCHLIST) tras el cierre del mercado;
+# un único hilo por proceso aunque Streamlit vuelva a ejecutar el script
+start_default_scheduler()
+
+# 📦 Descarga por lotes: varios símbolos en una sola llamada a Yahoo
+# Los históricos se guardan en un almacén Parquet local; a Yahoo solo se piden las fechas que faltan
+# Si un proceso de fondo publica la matriz compartida (financecompare.shared), se lee de ahí si está al día
+def get_historical_prices_batch(symbols, years):
     try:
-        end_date = datetime.today() + timedelta(days=1)  # Incluir día actual
-        start_date = end_date - timedelta(days=years * 365)
-        
-        # Primero intentar con yf.download
-        try:
-            hist = yf.download(symbol, start=start_date, end=end_date, progress=False)
-            if not hist.empty:
-                return hist[['Close']]
-        except:
-            pass
-        
-        # Si falla, intentar con yf.Ticker
-        try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(start=start_date, end=end_date)
-            return hist[['Close']]
-        except Exception as e:
-            st.error(f"Error obteniendo datos para {symbol}: {str(e)}")
-            return None
-            
+        return load_price_window(symbols, years)
     except Exception as e:
-        st.error(f"Error crítico obteniendo datos para {symbol}: {str(e)}")
+        st.error(f"Error obteniendo datos para {', '.join(symbols)}: {str(e)}")
         return None
 
-# 📈 Funciones de cálculo de métricas
-def calculate_cagr(prices, years):
-    if prices is None or prices.empty:
-        return None
-    start_price = prices.iloc[0][0]
-    end_price = prices.iloc[-1][0]
-    cagr = ((end_price / start_price) ** (1 / years) - 1) * 100
-    return round(cagr, 2)
+# 🪟 Ventana de precios: una sola descarga para todos los tickers, vistas recortadas por fecha
+def get_price_window(symbols, years, horizons=CAGR_HORIZONS):
+    # Descarga la ventana más amplia necesaria (años del slider y plazos de CAGR)
+    return get_historical_prices_batch(symbols, max([years] + list(horizons)))
 
-def calculate_volatility(prices):
-    if prices is None or prices.empty:
-        return None
-    returns = prices.iloc[:, 0].pct_change().dropna()
-    volatility = np.std(returns) * np.sqrt(252) * 100
-    return round(volatility, 2)
+# 🎨 Un color por símbolo, en el orden en que se ingresaron
+TICKER_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+                 '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
 
-def calculate_max_drawdown(prices):
-    if prices is None or prices.empty:
-        return None
-    cumulative = prices.iloc[:, 0].pct_change().add(1).cumprod()
-    peak = cumulative.expanding(min_periods=1).max()
-    drawdown = (cumulative/peak - 1) * 100
-    return round(drawdown.min(), 2)
+def ticker_color(position):
+    return TICKER_COLORS[position % len(TICKER_COLORS)]
+
+def hex_to_rgba(color, alpha):
+    red, green, blue = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgba({red}, {green}, {blue}, {alpha})"
+
+# 📈 Gráfico de precios normalizados
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def plot_price_comparison(prices, years, colors, _derived=None):
+    # Normalizar precios para comparación (índice acumulado compartido con las métricas)
+    norm_prices = cumulative_frame(prices, derived=_derived) * 100
+    
+    fig = go.Figure()
+    
+    for symbol in norm_prices.columns:
+        series = norm_prices[symbol].dropna()
+        fig.add_trace(go.Scatter(
+            x=series.index,
+            y=series,
+            name=f"{symbol}",
+            line=dict(color=colors[symbol], width=2)
+        ))
+    
+    fig.update_layout(
+        title=f"Comparación de Rendimiento ({years} años)",
+        xaxis_title="Fecha",
+        yaxis_title="Rendimiento Normalizado (%)",
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(color='#333333'),
+        legend_title_text='',
+        hovermode="x unified",
+        height=500
+    )
+    
+    return fig
 
 # 📊 Visualización de volatilidad mejorada
-def plot_volatility_comparison(prices1, prices2, name1, name2):
-    if prices1 is None or prices2 is None or prices1.empty or prices2.empty:
+VOLATILITY_WINDOWS = {21: "1 mes", 63: "3 meses", 126: "6 meses", 252: "12 meses"}
+WINDOW_DASHES = ['solid', 'dash', 'dot', 'dashdot']
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def plot_volatility_comparison(prices, windows=(63,), colors=None, _derived=None):
+    if prices is None or prices.empty or not windows:
         return None
+    colors = colors or {symbol: ticker_color(position) for position, symbol in enumerate(prices.columns)}
     
-    # Calcular volatilidad rolling (ventana de 3 meses)
-    returns1 = prices1.iloc[:, 0].pct_change().dropna()
-    rolling_vol1 = returns1.rolling(window=63).std() * np.sqrt(252) * 100
-    
-    returns2 = prices2.iloc[:, 0].pct_change().dropna()
-    rolling_vol2 = returns2.rolling(window=63).std() * np.sqrt(252) * 100
+    # Volatilidad rolling de todos los símbolos y ventanas en una sola llamada
+    rolling_vol = rolling_volatility(prices, windows, derived=_derived)
     
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=rolling_vol1.index,
-        y=rolling_vol1,
-        name=f"{name1}",
-        line=dict(color='#1f77b4', width=2),
-        fill='tozeroy',
-        fillcolor='rgba(31, 119, 180, 0.1)'
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=rolling_vol2.index,
-        y=rolling_vol2,
-        name=f"{name2}",
-        line=dict(color='#ff7f0e', width=2),
-        fill='tozeroy',
-        fillcolor='rgba(255, 127, 14, 0.1)'
-    ))
+    for window_position, window in enumerate(windows):
+        for symbol in prices.columns:
+            series = rolling_vol[window][symbol].dropna()
+            name = f"{symbol}" if len(windows) == 1 else f"{symbol} ({VOLATILITY_WINDOWS.get(window, window)})"
+            fig.add_trace(go.Scatter(
+                x=series.index,
+                y=series,
+                name=name,
+                line=dict(color=colors[symbol], width=2, dash=WINDOW_DASHES[window_position % len(WINDOW_DASHES)]),
+                fill='tozeroy' if window_position == 0 else None,
+                fillcolor=hex_to_rgba(colors[symbol], 0.1)
+            ))
     
+    window_labels = ", ".join(VOLATILITY_WINDOWS.get(window, f"{window} días") for window in windows)
     fig.update_layout(
-        title="Comparación de Volatilidad (Rolling 3 meses)",
+        title=f"Comparación de Volatilidad (Rolling {window_labels})",
         xaxis_title="Fecha",
         yaxis_title="Volatilidad Anualizada (%)",
         plot_bgcolor='white',
@@ -260,201 +239,208 @@ def plot_volatility_comparison(prices1, prices2, name1, name2):
     
     return fig
 
-# 🏆 Función para mostrar tarjeta de comparación
-def display_comparison_metric(value1, value2, title, unit="%", reverse=False):
-    if value1 is None or value2 is None:
+# 📝 Tarjeta de descripción (se repinta cuando llega la traducción)
+TRANSLATION_WAIT_SECONDS = 15
+
+def render_description(slot, description):
+    slot.markdown(f"""
+        <div class='metric-card'>
+            <p>{description}</p>
+        </div>
+    """, unsafe_allow_html=True)
+
+# 🏆 Función para mostrar tarjetas de comparación (diferencia respecto al primer símbolo)
+MAX_COLUMNS = 4
+
+def display_comparison_metric(values, title, unit="%", reverse=False):
+    values = values.dropna()
+    if values.empty:
         return
     
-    diff = value1 - value2
-    abs_diff = abs(diff)
-    
-    if diff > 0:
-        badge_class = "positive" if not reverse else "negative"
-        comparison_text = f"+{abs_diff:.2f}{unit}"
-    elif diff < 0:
-        badge_class = "negative" if not reverse else "positive"
-        comparison_text = f"-{abs_diff:.2f}{unit}"
-    else:
-        badge_class = "neutral"
-        comparison_text = f"0{unit}"
-    
-    col1, col2, col3 = st.columns([1, 1, 1])
+    benchmark_symbol = values.index[0]
+    benchmark = values.iloc[0]
+    symbols = list(values.index)
     
-    with col1:
-        st.markdown(f"<div class='metric-card'><h5>{title}</h5><h3>{value1:.2f}{unit}</h3></div>", unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"<div class='metric-card'><h5>{title}</h5><h3>{value2:.2f}{unit}</h3></div>", unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"<div class='metric-card'><h5>Diferencia</h5><h3><span class='comparison-badge {badge_class}'>{comparison_text}</span></h3></div>", unsafe_allow_html=True)
+    for row_start in range(0, len(symbols), MAX_COLUMNS):
+        row = symbols[row_start:row_start + MAX_COLUMNS]
+        for col, symbol in zip(st.columns(MAX_COLUMNS if len(symbols) > MAX_COLUMNS else len(symbols)), row):
+            value = values[symbol]
+            badge = ""
+            if symbol != benchmark_symbol:
+                diff = value - benchmark
+                abs_diff = abs(diff)
+                
+                if diff > 0:
+                    badge_class = "positive" if not reverse else "negative"
+                    comparison_text = f"+{abs_diff:.2f}{unit}"
+                elif diff < 0:
+                    badge_class = "negative" if not reverse else "positive"
+                    comparison_text = f"-{abs_diff:.2f}{unit}"
+                else:
+                    badge_class = "neutral"
+                    comparison_text = f"0{unit}"
+                badge = f"<span class='comparison-badge {badge_class}'>{comparison_text} vs {benchmark_symbol}</span>"
+            
+            with col:
+                st.markdown(f"<div class='metric-card'><h5>{title} · {symbol}</h5><h3>{value:.2f}{unit}{badge}</h3></div>", unsafe_allow_html=True)
 
 # 🧭 Sidebar para selección de tickers
 st.sidebar.header("🔍 Configuración de Análisis")
-ticker1 = st.sidebar.text_input("Símbolo 1 (Ej: AAPL)", "AAPL").upper()
-ticker2 = st.sidebar.text_input("Símbolo 2 (Ej: MSFT)", "MSFT").upper()
+symbols_input = st.sidebar.text_input("Símbolos separados por comas (Ej: AAPL, MSFT, GOOGL)", "AAPL, MSFT")
+tickers = list(dict.fromkeys(s.strip().upper() for s in symbols_input.split(",") if s.strip()))
 years = st.sidebar.slider("Años históricos", 1, 10, 5)
+volatility_windows = st.sidebar.multiselect(
+    "Ventanas de volatilidad rolling",
+    list(VOLATILITY_WINDOWS),
+    default=[63],
+    format_func=lambda window: VOLATILITY_WINDOWS[window]
+)
 
 # 📌 Obtención de datos
-if ticker1 and ticker2:
-    # Info de empresas
-    company1 = get_company_info(ticker1)
-    company2 = get_company_info(ticker2)
+if len(tickers) >= 2:
+    # Info de empresas en el pool de fondo mientras se descargan los precios
+    company_futures = {symbol: submit_fetch(get_company_info, symbol) for symbol in tickers}
     
-    # Precios históricos
-    prices1 = get_historical_prices(ticker1, years)
-    prices2 = get_historical_prices(ticker2, years)
+    # Precios históricos (una sola descarga por lotes, reutilizada en todos los plazos)
+    window = get_price_window(tickers, years)
+    
+    companies = {symbol: future.result() for symbol, future in company_futures.items()}
+    for symbol, company in companies.items():
+        if "error" in company:
+            st.error(f"Error con {symbol}: {company['error']}")
+    tickers = [symbol for symbol in tickers if "error" not in companies[symbol]]
+    
+    if window is not None:
+        window = window[[symbol for symbol in tickers if symbol in window]].dropna(axis=1, how='all')
+    prices = slice_price_window(window, years)
+    # Rendimientos e índice acumulado de una sola pasada para métricas y gráficos
+    derived = DerivedSeries(prices) if prices is not None and not prices.empty else None
     
     # Mostrar información de las empresas
-    if "error" not in company1 and "error" not in company2:
-        col1, col2 = st.columns(2)
+    if tickers:
+        # Descripciones sin traducir: se pintan en original y se sustituyen al final
+        pending_translations = []
         
-        with col1:
-            st.markdown(f"""
-                <div class='ticker-header'>
-                    <h2 class='ticker-color-1'>📌 {company1['name']} ({ticker1})</h2>
-                </div>
-            """, unsafe_allow_html=True)
-            st.markdown(f"""
-                <div class='metric-card'>
-                    <p><strong>Sector:</strong> {company1['sector']}</p>
-                    <p><strong>Industria:</strong> {company1['industry']}</p>
-                    <p><strong>País:</strong> {company1['country']}</p>
-                    <p><strong>Capitalización:</strong> {company1['market_cap']} {company1['currency']}</p>
-                </div>
-                <div class='metric-card'>
-                    <p>{company1['description']}</p>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"""
-                <div class='ticker-header'>
-                    <h2 class='ticker-color-2'>📌 {company2['name']} ({ticker2})</h2>
-                </div>
-            """, unsafe_allow_html=True)
-            st.markdown(f"""
-                <div class='metric-card'>
-                    <p><strong>Sector:</strong> {company2['sector']}</p>
-                    <p><strong>Industria:</strong> {company2['industry']}</p>
-                    <p><strong>País:</strong> {company2['country']}</p>
-                    <p><strong>Capitalización:</strong> {company2['market_cap']} {company2['currency']}</p>
-                </div>
-                <div class='metric-card'>
-                    <p>{company2['description']}</p>
-                </div>
-            """, unsafe_allow_html=True)
+        for row_start in range(0, len(tickers), MAX_COLUMNS):
+            row = tickers[row_start:row_start + MAX_COLUMNS]
+            for col, symbol in zip(st.columns(MAX_COLUMNS if len(tickers) > MAX_COLUMNS else len(tickers)), row):
+                company = companies[symbol]
+                with col:
+                    st.markdown(f"""
+                        <div class='ticker-header'>
+                            <h2 style='color: {ticker_color(tickers.index(symbol))}'>📌 {company['name']} ({symbol})</h2>
+                        </div>
+                    """, unsafe_allow_html=True)
+                    st.markdown(f"""
+                        <div class='metric-card'>
+                            <p><strong>Sector:</strong> {company['sector']}</p>
+                            <p><strong>Industria:</strong> {company['industry']}</p>
+                            <p><strong>País:</strong> {company['country']}</p>
+                            <p><strong>Capitalización:</strong> {company['market_cap']} {company['currency']}</p>
+                        </div>
+                    """, unsafe_allow_html=True)
+                    description_slot = st.empty()
+                    render_description(description_slot, company['description'])
+                    if not company['translated']:
+                        pending_translations.append((description_slot, translate_description_async(company['description'])))
         
         # 📈 Gráfico de comparación de precios (CORREGIDO)
         st.subheader("📈 Comparación de Precios Históricos (Normalizados)")
-        if prices1 is not None and prices2 is not None and not prices1.empty and not prices2.empty:
-            # Normalizar precios para comparación
-            norm_prices1 = prices1 / prices1.iloc[0] * 100
-            norm_prices2 = prices2 / prices2.iloc[0] * 100
-            
-            fig = go.Figure()
+        if prices is not None and not prices.empty:
+            colors = {symbol: ticker_color(tickers.index(symbol)) for symbol in prices.columns}
+            st.plotly_chart(plot_price_comparison(prices, years, colors, _derived=derived), use_container_width=True)
+        else:
+            st.warning("No hay suficientes datos para mostrar la comparación de precios")
+        
+        if prices is not None and not prices.empty:
+            # 📊 Comparación de métricas
+            st.subheader("📊 Comparación de Métricas Clave")
             
-            fig.add_trace(go.Scatter(
-                x=norm_prices1.index,
-                y=norm_prices1['Close'],
-                name=f"{ticker1}",
-                line=dict(color='#1f77b4', width=2)
-            ))
+            # CAGR a diferentes plazos
+            st.markdown("**Rendimiento Anualizado (CAGR)**")
+            cagr_by_horizon = compute_cagr_horizons_cached(window, CAGR_HORIZONS)
+            for horizon in CAGR_HORIZONS:
+                horizon_label = "1 Año" if horizon == 1 else f"{horizon} Años"
+                display_comparison_metric(cagr_by_horizon.loc[horizon], horizon_label)
             
-            fig.add_trace(go.Scatter(
-                x=norm_prices2.index,
-                y=norm_prices2['Close'],
-                name=f"{ticker2}",
-                line=dict(color='#ff7f0e', width=2)
-            ))
+            # Fórmula del CAGR
+            st.markdown("""
+            <div class='formula-box'>
+                <strong>Fórmula del CAGR:</strong><br>
+                CAGR = [(Precio Final / Precio Inicial)<sup>(1/Número de Años)</sup> - 1] × 100<br>
+                Donde:<br>
+                - Precio Final = Último precio de cierre<br>
+                - Precio Inicial = Primer precio de cierre<br>
+                - Número de Años = Tiempo real transcurrido entre ambos cierres, en años
+            </div>
+            """, unsafe_allow_html=True)
             
-            fig.update_layout(
-                title=f"Comparación de Rendimiento ({years} años)",
-                xaxis_title="Fecha",
-                yaxis_title="Rendimiento Normalizado (%)",
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                font=dict(color='#333333'),
-                legend_title_text='',
-                hovermode="x unified",
-                height=500
-            )
+            # Volatilidad y drawdown
+            st.markdown("**Riesgo**")
+            metrics = compute_metrics_cached(prices, years, _derived=derived)
+            display_comparison_metric(metrics["volatility"], "Volatilidad Anualizada", reverse=True)
+            display_comparison_metric(metrics["max_drawdown"], "Máximo Drawdown", reverse=True)
             
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.warning("No hay suficientes datos para mostrar la comparación de precios")
-        
-        # 📊 Comparación de métricas
-        st.subheader("📊 Comparación de Métricas Clave")
-        
-        # CAGR a diferentes plazos
-        st.markdown("**Rendimiento Anualizado (CAGR)**")
-        cagr1_1y = calculate_cagr(get_historical_prices(ticker1, 1), 1)
-        cagr2_1y = calculate_cagr(get_historical_prices(ticker2, 1), 1)
-        display_comparison_metric(cagr1_1y, cagr2_1y, "1 Año")
-        
-        cagr1_3y = calculate_cagr(get_historical_prices(ticker1, 3), 3)
-        cagr2_3y = calculate_cagr(get_historical_prices(ticker2, 3), 3)
-        display_comparison_metric(cagr1_3y, cagr2_3y, "3 Años")
-        
-        cagr1_5y = calculate_cagr(get_historical_prices(ticker1, 5), 5)
-        cagr2_5y = calculate_cagr(get_historical_prices(ticker2, 5), 5)
-        display_comparison_metric(cagr1_5y, cagr2_5y, "5 Años")
-        
-        # Fórmula del CAGR
-        st.markdown("""
-        <div class='formula-box'>
-            <strong>Fórmula del CAGR:</strong><br>
-            CAGR = [(Precio Final / Precio Inicial)<sup>(1/Número de Años)</sup> - 1] × 100<br>
-            Donde:<br>
-            - Precio Final = Último precio de cierre<br>
-            - Precio Inicial = Primer precio de cierre<br>
-            - Número de Años = Período de tiempo en años
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Volatilidad y drawdown
-        st.markdown("**Riesgo**")
-        vol1 = calculate_volatility(prices1) if prices1 is not None and not prices1.empty else None
-        vol2 = calculate_volatility(prices2) if prices2 is not None and not prices2.empty else None
-        display_comparison_metric(vol1, vol2, "Volatilidad Anualizada", reverse=True)
-        
-        max_dd1 = calculate_max_drawdown(prices1) if prices1 is not None and not prices1.empty else None
-        max_dd2 = calculate_max_drawdown(prices2) if prices2 is not None and not prices2.empty else None
-        display_comparison_metric(max_dd1, max_dd2, "Máximo Drawdown", reverse=True)
-        
-        # Fórmula de Volatilidad
-        st.markdown("""
-        <div class='formula-box'>
-            <strong>Fórmula de Volatilidad Anualizada:</strong><br>
-            σ = Desviación Estándar(Rendimientos Diarios) × √252 × 100<br>
-            Donde:<br>
-            - 252 = Número aproximado de días de trading en un año<br>
-            - Rendimientos Diarios = (Precio<sub>t</sub> / Precio<sub>t-1</sub>) - 1
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Visualización avanzada de volatilidad
-        st.subheader("📌 Comparación de Volatilidad")
-        vol_fig = plot_volatility_comparison(prices1, prices2, ticker1, ticker2)
-        if vol_fig:
-            st.plotly_chart(vol_fig, use_container_width=True)
+            # Fórmula de Volatilidad
             st.markdown("""
-                <div class='metric-card'>
-                    <p>La volatilidad rolling muestra la variabilidad de los rendimientos en una ventana móvil de 3 meses. 
-                    Una mayor volatilidad indica mayor riesgo. Esta visualización ayuda a identificar períodos de mayor 
-                    incertidumbre en cada activo.</p>
-                </div>
+            <div class='formula-box'>
+                <strong>Fórmula de Volatilidad Anualizada:</strong><br>
+                σ = Desviación Estándar(Rendimientos Diarios) × √252 × 100<br>
+                Donde:<br>
+                - 252 = Número aproximado de días de trading en un año<br>
+                - Rendimientos Diarios = (Precio<sub>t</sub> / Precio<sub>t-1</sub>) - 1
+            </div>
             """, unsafe_allow_html=True)
-    
-    else:
-        if "error" in company1:
-            st.error(f"Error con {ticker1}: {company1['error']}")
-        if "error" in company2:
-            st.error(f"Error con {ticker2}: {company2['error']}")
+            
+            # Visualización avanzada de volatilidad
+            st.subheader("📌 Comparación de Volatilidad")
+            vol_fig = plot_volatility_comparison(prices, tuple(sorted(volatility_windows)), colors,
+                                                 _derived=derived)
+            if vol_fig:
+                window_labels = ", ".join(VOLATILITY_WINDOWS[window] for window in sorted(volatility_windows))
+                st.plotly_chart(vol_fig, use_container_width=True)
+                st.markdown(f"""
+                    <div class='metric-card'>
+                        <p>La volatilidad rolling muestra la variabilidad de los rendimientos en una ventana móvil ({window_labels}). 
+                        Una mayor volatilidad indica mayor riesgo. Esta visualización ayuda a identificar períodos de mayor 
+                        incertidumbre en cada activo.</p>
+                    </div>
+                """, unsafe_allow_html=True)
+        
+        # 🌐 Traducciones diferidas: la página ya está pintada, se cambia el texto al llegar
+        for slot, future in pending_translations:
+            try:
+                render_description(slot, future.result(timeout=TRANSLATION_WAIT_SECONDS))
+            except Exception:
+                pass
 else:
-    st.warning("Por favor ingrese dos símbolos válidos para comparar")
-
+    st.warning("Por favor ingrese al menos dos símbolos válidos para comparar")
 
+# 🧠 Memoria de la caché de precios (compartida por todas las sesiones del servidor)
+price_cache = default_frame_cache()
+cache_stats = price_cache.stats()
+st.sidebar.caption(
+    f"Caché de precios: {cache_stats['bytes'] / 2**20:.1f} / {cache_stats['max_bytes'] / 2**20:.0f} MB · "
+    f"{cache_stats['entries']} series · {cache_stats['evictions']} expulsiones"
+)
+with st.sidebar.expander("Memoria por símbolo"):
+    st.dataframe(
+        pd.Series(price_cache.sizes(), name="KB", dtype="float64").div(1024).round(1),
+        use_container_width=True
+    )
 
+# 🚦 Ritmo hacia Yahoo (límite compartido por todo el proceso)
+yahoo_stats = throttle_stats()
+st.sidebar.caption(
+    f"Yahoo: {yahoo_stats['calls']} llamadas · {yahoo_stats['throttled']} limitadas (429) · "
+    f"{yahoo_stats['retries']} reintentos · ritmo {yahoo_stats['rate']:g}/{yahoo_stats['max_rate']:g} por s"
+)
 
+# 🔌 Sesión HTTP compartida: conexiones reutilizadas y coste de DNS/TLS de las nuevas
+connection_stats = http_stats()
+st.sidebar.caption(
+    f"HTTP: {connection_stats['requests']} peticiones · {connection_stats['reused']} con conexión reutilizada · "
+    f"DNS {connection_stats['avg_dns_ms']:.0f} ms · TLS {connection_stats['avg_tls_ms']:.0f} ms por conexión nueva"
+)
+with st.sidebar.expander("Últimas llamadas HTTP"):
+    st.dataframe(pd.DataFrame(recent_http_calls()), use_container_width=True)
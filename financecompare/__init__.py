@@ -0,0 +1 @@
+"""Capa de datos y métricas de FinanceCompare Pro, reutilizable fuera de Streamlit."""
@@ -0,0 +1,3 @@
+from financecompare.cli import main
+
+main()
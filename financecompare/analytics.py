@@ -0,0 +1,66 @@
+"""Comparaciones listas para servir: la misma carga de precios y métricas para la app, la CLI y la API."""
+import math
+
+from financecompare.metrics import compute_cagr_horizons, compute_metrics
+from financecompare.prices import get_historical_prices_batch, price_dates, slice_price_window
+from financecompare.shared import default_shared_matrix
+
+CAGR_HORIZONS = [1, 3, 5]
+# Años de historia que aceptan la CLI y la API
+MAX_YEARS = 50
+
+
+def load_price_window(symbols, years):
+    """DataFrame ancho de los últimos ``years`` años; lanza la excepción si falla.
+
+    Si un proceso de fondo publica la matriz compartida y está al día se copian
+    de ahí solo los símbolos pedidos; si no, se pasa por el almacén Parquet y la
+    caché en memoria.
+    """
+    shared = default_shared_matrix().get(symbols, *price_dates(years))
+    if shared is not None:
+        return shared
+    return get_historical_prices_batch(symbols, years)
+
+
+def normalize_symbols(symbols):
+    return list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+
+
+def compare(symbols, years, horizons=CAGR_HORIZONS):
+    """Una fila por símbolo con CAGR, CAGR por horizonte, volatilidad y máximo drawdown.
+
+    Descarga la ventana más amplia una sola vez (por lotes) y calcula todas las
+    columnas en una pasada del motor de métricas, como la app.
+    """
+    symbols = normalize_symbols(symbols)
+    window = load_price_window(symbols, max([years] + list(horizons)))
+    prices = slice_price_window(window, years)
+
+    metrics = compute_metrics(prices, years).round(2)
+    # El CAGR del periodo sale de la misma fila que los horizontes: nunca pueden discrepar
+    by_horizon = compute_cagr_horizons(window, list(dict.fromkeys(list(horizons) + [years]))).round(2)
+
+    rows = []
+    for symbol in symbols:
+        series = prices[symbol].dropna() if symbol in prices else prices.iloc[:0, 0]
+        row = {
+            "symbol": symbol,
+            "first_date": series.index[0].date().isoformat() if not series.empty else None,
+            "last_date": series.index[-1].date().isoformat() if not series.empty else None,
+            "last_close": round(float(series.iloc[-1]), 4) if not series.empty else None,
+            "cagr": _value(by_horizon.T, symbol, years),
+        }
+        for horizon in horizons:
+            row[f"cagr_{horizon}y"] = _value(by_horizon.T, symbol, horizon)
+        row["volatility"] = _value(metrics, symbol, "volatility")
+        row["max_drawdown"] = _value(metrics, symbol, "max_drawdown")
+        rows.append(row)
+    return rows
+
+
+def _value(table, symbol, column):
+    if symbol not in table.index:
+        return None
+    value = float(table.loc[symbol, column])
+    return None if math.isnan(value) else value
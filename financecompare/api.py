@@ -0,0 +1,211 @@
+"""API HTTP local con las mismas comparaciones y métricas que la app, sin ejecutar Streamlit.
+
+    python -m financecompare.api --port 8765
+
+    GET /compare?symbols=AAPL,MSFT&years=5   filas de comparación (como la CLI)
+    GET /metrics?symbols=AAPL,MSFT&years=5   CAGR, volatilidad y máximo drawdown
+    GET /info/AAPL                           info de empresa
+    GET /health                              estado de las cachés
+
+Las tablas se sirven en JSON o, con ``format=arrow`` o la cabecera
+``Accept: application/vnd.apache.arrow.stream``, como stream IPC de Arrow.
+Comparte el almacén Parquet, la matriz compartida y las cachés del proceso.
+"""
+import argparse
+import json
+import os
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pyarrow as pa
+from cachetools import TTLCache
+
+from financecompare.analytics import CAGR_HORIZONS, MAX_YEARS, compare, load_price_window, normalize_symbols
+from financecompare.framecache import default_frame_cache
+from financecompare.info import company_info_cache
+from financecompare.metrics import compute_metrics
+from financecompare.prefetch import start_default_scheduler
+from financecompare.prices import price_flights, slice_price_window
+from financecompare.session import http_stats
+from financecompare.throttle import throttle_stats
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+# Yahoo responde 404 a los símbolos que no existen
+NOT_FOUND_MARKERS = ("404", "Not Found")
+
+# Respuestas ya serializadas de /compare y /metrics: las peticiones repetidas no recalculan nada
+API_CACHE_SECONDS = float(os.environ.get("FINANCECOMPARE_API_CACHE_SECONDS", "60"))
+API_CACHE_ENTRIES = int(os.environ.get("FINANCECOMPARE_API_CACHE_ENTRIES", "1024"))
+
+_responses = TTLCache(maxsize=API_CACHE_ENTRIES, ttl=API_CACHE_SECONDS)
+_responses_lock = threading.Lock()
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def metrics_rows(symbols, years):
+    """CAGR, volatilidad y máximo drawdown por símbolo, redondeados como en la app."""
+    symbols = normalize_symbols(symbols)
+    prices = slice_price_window(load_price_window(symbols, years), years)
+    metrics = compute_metrics(prices, years).round(2)
+    metrics = metrics.astype(object).where(metrics.notna(), None)
+    return [{"symbol": symbol, **metrics.loc[symbol].to_dict()} if symbol in metrics.index
+            else {"symbol": symbol, "cagr": None, "volatility": None, "max_drawdown": None}
+            for symbol in symbols]
+
+
+def company_info(symbol):
+    """Info de empresa; un símbolo que Yahoo no conoce es un 404, cualquier otro fallo un 502."""
+    try:
+        return company_info_cache.get(symbol)
+    except Exception as e:
+        if any(marker in str(e) for marker in NOT_FOUND_MARKERS):
+            raise ApiError(HTTPStatus.NOT_FOUND, f"símbolo desconocido: {symbol}")
+        raise ApiError(HTTPStatus.BAD_GATEWAY, f"Error al obtener datos: {e}")
+
+
+def encode_rows(rows, arrow):
+    if arrow:
+        sink = pa.BufferOutputStream()
+        table = pa.Table.from_pylist(rows)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes(), ARROW_MEDIA_TYPE
+    return encode_json(rows)
+
+
+def encode_json(payload):
+    return json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"), "application/json; charset=utf-8"
+
+
+def _symbols(query):
+    symbols = [symbol for value in query.get("symbols", []) for symbol in value.split(",")]
+    symbols = normalize_symbols(symbols)
+    if not symbols:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "indique symbols=AAPL,MSFT")
+    return symbols
+
+
+def _int_list(query, name, default):
+    values = [value for raw in query.get(name, []) for value in raw.split(",") if value]
+    try:
+        parsed = [int(value) for value in values] or list(default)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} debe ser una lista de enteros")
+    if any(not 1 <= value <= MAX_YEARS for value in parsed):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} debe estar entre 1 y {MAX_YEARS}")
+    return parsed
+
+
+def _cached_table(key, build, arrow):
+    key = key + (arrow,)
+    with _responses_lock:
+        response = _responses.get(key)
+    if response is None:
+        response = encode_rows(build(), arrow)
+        with _responses_lock:
+            _responses[key] = response
+    return response
+
+
+def route(path, query, arrow=False):
+    """Resuelve una petición GET y devuelve ``(cuerpo, content_type)``."""
+    parts = [unquote(part) for part in path.strip("/").split("/") if part]
+
+    if parts == ["compare"]:
+        symbols = _symbols(query)
+        years = _int_list(query, "years", [5])[0]
+        horizons = _int_list(query, "horizons", CAGR_HORIZONS)
+        return _cached_table(("compare", tuple(symbols), years, tuple(horizons)),
+                             lambda: compare(symbols, years, horizons), arrow)
+
+    if parts == ["metrics"]:
+        symbols = _symbols(query)
+        years = _int_list(query, "years", [5])[0]
+        return _cached_table(("metrics", tuple(symbols), years), lambda: metrics_rows(symbols, years), arrow)
+
+    if len(parts) == 2 and parts[0] == "info":
+        # La info de empresa ya tiene su propia caché con revalidación en segundo plano
+        return encode_json(company_info(parts[1].upper()))
+
+    if parts == ["health"]:
+        with _responses_lock:
+            cached_responses = len(_responses)
+        return encode_json({"status": "ok", "price_cache": default_frame_cache().stats(),
+                            "yahoo": throttle_stats(), "http": http_stats(), "cached_responses": cached_responses,
+                            "coalescing": {"prices": price_flights.stats(),
+                                           "info": company_info_cache.flight_stats()}})
+
+    raise ApiError(HTTPStatus.NOT_FOUND, f"ruta desconocida: {path}")
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantiene la conexión abierta entre peticiones del mismo cliente
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo van en escrituras separadas: sin Nagle no se espera el ACK retrasado
+    disable_nagle_algorithm = True
+    server_version = "FinanceCompareAPI/1.0"
+    quiet = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        arrow = query.get("format", [""])[-1] == "arrow" or ARROW_MEDIA_TYPE in self.headers.get("Accept", "")
+        status = HTTPStatus.OK
+        try:
+            body, content_type = route(url.path, query, arrow)
+        except ApiError as e:
+            status = e.status
+            body, content_type = encode_json({"error": str(e)})
+        except Exception as e:
+            # Fallos de Yahoo o del almacén: el cliente puede reintentar
+            status = HTTPStatus.BAD_GATEWAY
+            body, content_type = encode_json({"error": str(e)})
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(host="127.0.0.1", port=8765, quiet=True):
+    handler = type("ConfiguredApiHandler", (ApiHandler,), {"quiet": quiet})
+    return ApiServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP local de FinanceCompare Pro.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--verbose", action="store_true", help="Registrar cada petición")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, quiet=not args.verbose)
+    start_default_scheduler()
+    print(f"Escuchando en http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
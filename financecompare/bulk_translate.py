@@ -0,0 +1,130 @@
+"""Pre-calentado de traducciones para un universo de símbolos.
+
+Descarga ``longBusinessSummary`` de cada símbolo, traduce por lotes con un
+intervalo mínimo entre lotes y guarda el resultado en el mismo
+``TranslationStore`` que consulta ``get_company_info``::
+
+    python -m financecompare.bulk_translate --symbols-file universo.txt
+    python -m financecompare.bulk_translate AAPL MSFT --stub   # sin red
+"""
+import argparse
+import json
+import time
+
+import yfinance as yf
+from deep_translator import GoogleTranslator
+
+from financecompare.concurrency import submit_fetch
+from financecompare.session import http_session
+from financecompare.throttle import yahoo_call
+from financecompare.translation import MAX_TRANSLATION_CHARS, default_translation_store
+
+DEFAULT_CHUNK_SIZE = 50
+# Segundos mínimos entre dos lotes enviados al traductor
+DEFAULT_CHUNK_INTERVAL = 1.0
+
+
+class StubTranslator:
+    """Traductor local para pruebas y ejecuciones sin conexión."""
+
+    def __init__(self, target="es"):
+        self.target = target
+
+    def translate_batch(self, batch):
+        return [f"[{self.target}] {text}" for text in batch]
+
+
+def fetch_summary(symbol):
+    return yahoo_call(lambda: yf.Ticker(symbol, session=http_session()).info).get("longBusinessSummary")
+
+
+def fetch_summaries(symbols, fetch=fetch_summary):
+    # Descarga concurrente en el pool compartido; los símbolos que fallan se omiten
+    futures = {symbol: submit_fetch(fetch, symbol) for symbol in symbols}
+    summaries = {}
+    for symbol, future in futures.items():
+        try:
+            summary = future.result()
+        except Exception:
+            continue
+        if summary:
+            summaries[symbol] = summary
+    return summaries
+
+
+def translate_universe(symbols, target="es", store=None, translator=None,
+                       chunk_size=DEFAULT_CHUNK_SIZE, chunk_interval=DEFAULT_CHUNK_INTERVAL,
+                       fetch=fetch_summary):
+    """Traduce y guarda las descripciones que aún no están en el almacén.
+
+    Devuelve un resumen con el número de símbolos, descripciones encontradas,
+    ya cacheadas, traducidas y fallidas.
+    """
+    symbols = list(dict.fromkeys(symbols))
+
+    summaries = fetch_summaries(symbols, fetch=fetch)
+    report = translate_texts(summaries.values(), target=target, store=store, translator=translator,
+                             chunk_size=chunk_size, chunk_interval=chunk_interval)
+    return {"symbols": len(symbols), **report}
+
+
+def translate_texts(texts, target="es", store=None, translator=None,
+                    chunk_size=DEFAULT_CHUNK_SIZE, chunk_interval=DEFAULT_CHUNK_INTERVAL):
+    """Traduce por lotes los textos que aún no están en el almacén y los guarda."""
+    store = store or default_translation_store()
+    translator = translator or GoogleTranslator(source='auto', target=target)
+    texts = list(dict.fromkeys(text[:MAX_TRANSLATION_CHARS] for text in texts if text))
+    missing = [text for text in texts if store.get(text, target) is None]
+
+    translated = failed = 0
+    last_chunk = None
+    for i in range(0, len(missing), chunk_size):
+        chunk = missing[i:i + chunk_size]
+        if last_chunk is not None:
+            time.sleep(max(0.0, chunk_interval - (time.monotonic() - last_chunk)))
+        last_chunk = time.monotonic()
+        try:
+            results = translator.translate_batch(chunk)
+        except Exception:
+            failed += len(chunk)
+            continue
+        for text, translation in zip(chunk, results):
+            if translation:
+                store.put(text, target, translation)
+                translated += 1
+            else:
+                failed += 1
+
+    return {
+        "descriptions": len(texts),
+        "cached": len(texts) - len(missing),
+        "translated": translated,
+        "failed": failed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-calienta las traducciones de descripciones.")
+    parser.add_argument("symbols", nargs="*", help="Símbolos a procesar")
+    parser.add_argument("--symbols-file", help="Archivo con un símbolo por línea")
+    parser.add_argument("--target", default="es", help="Idioma destino (por defecto: es)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--chunk-interval", type=float, default=DEFAULT_CHUNK_INTERVAL)
+    parser.add_argument("--stub", action="store_true", help="Usar el traductor local (sin red)")
+    args = parser.parse_args(argv)
+
+    symbols = [symbol.upper() for symbol in args.symbols]
+    if args.symbols_file:
+        with open(args.symbols_file, encoding="utf-8") as handle:
+            symbols += [line.strip().upper() for line in handle if line.strip()]
+    if not symbols:
+        parser.error("indique símbolos o --symbols-file")
+
+    translator = StubTranslator(args.target) if args.stub else None
+    report = translate_universe(symbols, target=args.target, translator=translator,
+                                chunk_size=args.chunk_size, chunk_interval=args.chunk_interval)
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Modo sin interfaz: las mismas métricas de la app, sin Streamlit ni Plotly.
+
+    python -m financecompare compare AAPL MSFT --years 5 --format json
+    python -m financecompare compare --symbols-file universo.txt --format csv > informe.csv
+"""
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+from financecompare.analytics import MAX_YEARS, compare
+
+FORMATS = ("json", "csv", "table")
+
+
+def render(rows, output_format):
+    if output_format == "json":
+        return json.dumps(rows, ensure_ascii=False, indent=2)
+    frame = pd.DataFrame(rows).set_index("symbol")
+    if output_format == "csv":
+        return frame.to_csv()
+    return frame.to_string()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="financecompare",
+                                     description="Análisis de FinanceCompare Pro sin interfaz.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compare_parser = commands.add_parser("compare", help="Compara métricas de varios símbolos")
+    compare_parser.add_argument("symbols", nargs="*", help="Símbolos a comparar")
+    compare_parser.add_argument("--symbols-file", help="Archivo con un símbolo por línea")
+    compare_parser.add_argument("--years", type=int, default=5, help="Años históricos (por defecto: 5)")
+    compare_parser.add_argument("--format", choices=FORMATS, default="table")
+
+    args = parser.parse_args(argv)
+
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file, encoding="utf-8") as handle:
+            symbols += [line.strip() for line in handle if line.strip()]
+    if not symbols:
+        parser.error("indique símbolos o --symbols-file")
+    if not 1 <= args.years <= MAX_YEARS:
+        parser.error(f"--years debe estar entre 1 y {MAX_YEARS}")
+
+    sys.stdout.write(render(compare(symbols, args.years), args.format) + "\n")
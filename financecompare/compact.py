@@ -0,0 +1,75 @@
+"""Representación compacta de precios para universos grandes.
+
+Un calendario compartido en días ``int32`` (desde 1970-01-01) y una matriz
+contigua de cierres ``float32`` (fechas × símbolos). Frente a un DataFrame por
+símbolo con ``float64`` e índice de fechas propio, ocupa menos de la mitad, y
+``to_frame`` / ``to_numpy`` devuelven vistas sin copiar los cierres.
+
+Expone ``index``, ``columns``, ``to_numpy`` y ``__array__`` como un DataFrame,
+así que ``compute_metrics`` y las demás funciones de ``financecompare.metrics``
+la aceptan tal cual. Los kernels calculan en ``float64``: cada llamada convierte
+(y por tanto copia) la matriz ``float32`` una vez.
+"""
+import numpy as np
+import pandas as pd
+
+from financecompare.prices import load_prices_batch
+
+EPOCH = np.datetime64("1970-01-01", "D")
+
+
+class CompactPrices:
+
+    def __init__(self, days, symbols, closes):
+        self.days = np.ascontiguousarray(days, dtype="int32")
+        self.symbols = list(symbols)
+        self.closes = np.ascontiguousarray(closes, dtype="float32")
+        if self.closes.shape != (len(self.days), len(self.symbols)):
+            raise ValueError("closes debe tener forma (fechas, símbolos)")
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_frame(cls, prices):
+        # DataFrame ancho (fechas × símbolos) → calendario int32 + matriz float32
+        dates = pd.DatetimeIndex(prices.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        days = (dates.values.astype("datetime64[D]") - EPOCH).astype("int32")
+        return cls(days, prices.columns, prices.to_numpy(dtype="float32"))
+
+    @property
+    def dates(self):
+        return pd.DatetimeIndex((EPOCH + self.days.astype("int64")).astype("datetime64[ns]"), name="Date")
+
+    @property
+    def index(self):
+        return self.dates
+
+    @property
+    def columns(self):
+        return pd.Index(self.symbols)
+
+    @property
+    def nbytes(self):
+        return self.days.nbytes + self.closes.nbytes
+
+    def to_numpy(self):
+        return self.closes
+
+    def __array__(self, dtype=None, copy=None):
+        # np.asarray(compact, dtype="float64") convierte y copia; sin dtype es la propia matriz
+        if dtype is None or np.dtype(dtype) == self.closes.dtype:
+            return self.closes.copy() if copy else self.closes
+        return self.closes.astype(dtype)
+
+    def column(self, symbol):
+        # Vista de los cierres de un símbolo (sin copia)
+        return self.closes[:, self._positions[symbol]]
+
+    def to_frame(self):
+        # DataFrame sobre la misma memoria: modificarlo modifica esta matriz
+        return pd.DataFrame(self.closes, index=self.dates, columns=self.symbols, copy=False)
+
+
+def load_compact_prices(symbols, start_date, end_date, store=None):
+    return CompactPrices.from_frame(load_prices_batch(symbols, start_date, end_date, store=store))
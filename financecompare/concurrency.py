@@ -0,0 +1,82 @@
+"""Pool de hilos acotado y compartido para las llamadas de red, y agrupación de llamadas idénticas."""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Máximo de llamadas de red simultáneas en todo el proceso (todas las sesiones)
+FETCH_WORKERS = int(os.environ.get("FINANCECOMPARE_FETCH_WORKERS", "8"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def fetch_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS,
+                                           thread_name_prefix="financecompare-fetch")
+        return _executor
+
+
+def submit_fetch(fn, *args, **kwargs):
+    """Lanza ``fn`` en el pool compartido y devuelve su ``Future``.
+
+    Las tareas no deben esperar a otras tareas del mismo pool: con todos los
+    hilos ocupados eso bloquearía el proceso.
+    """
+    return fetch_executor().submit(fn, *args, **kwargs)
+
+
+class SingleFlight:
+    """Agrupa llamadas simultáneas con la misma clave en una sola ejecución.
+
+    El primer hilo que pide una clave la ejecuta; los que llegan mientras
+    tanto esperan ese mismo resultado (o excepción) en lugar de repetir la
+    descarga. Al terminar, la clave se libera: no es una caché.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        return self.do_many([key], lambda keys: {key: fn(*args, **kwargs)})[key]
+
+    def do_many(self, keys, fn):
+        """Como ``do`` para varias claves: ``fn(claves)`` recibe solo las que nadie
+        está cargando ya y devuelve ``{clave: valor}``; las demás se esperan."""
+        keys = list(dict.fromkeys(keys))
+        with self._lock:
+            waiting = {key: self._calls[key] for key in keys if key in self._calls}
+            own = {key: Future() for key in keys if key not in waiting}
+            self._calls.update(own)
+            self.coalesced += len(waiting)
+            self.executions += bool(own)
+
+        results = {}
+        if own:
+            try:
+                results = fn(list(own))
+                for key, future in own.items():
+                    future.set_result(results[key])
+            except BaseException as e:
+                for future in own.values():
+                    if not future.done():
+                        future.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    for key, future in own.items():
+                        if self._calls.get(key) is future:
+                            del self._calls[key]
+
+        results = {key: results[key] for key in own}
+        results.update({key: future.result() for key, future in waiting.items()})
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {"in_flight": len(self._calls), "executions": self.executions, "coalesced": self.coalesced}
@@ -0,0 +1,97 @@
+"""Caché en memoria de series de precios con presupuesto de bytes y expulsión LRU."""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+# Presupuesto de memoria para todas las series cacheadas del proceso
+PRICE_CACHE_MB = float(os.environ.get("FINANCECOMPARE_PRICE_CACHE_MB", "256"))
+PRICE_CACHE_TTL = timedelta(minutes=float(os.environ.get("FINANCECOMPARE_PRICE_CACHE_TTL_MINUTES", "15")))
+
+
+def frame_nbytes(frame):
+    return int(frame.memory_usage(deep=True, index=True).sum()) if hasattr(frame, "columns") \
+        else int(frame.memory_usage(deep=True, index=True))
+
+
+class PriceFrameCache:
+    """Una serie de cierres por símbolo, la más larga cargada, compartida por todas las sesiones.
+
+    Las peticiones de menos años se sirven recortando la misma serie, así que
+    la memoria crece con los símbolos y no con cada combinación (símbolo, años).
+    Al superar ``max_bytes`` se expulsan las series usadas hace más tiempo.
+    """
+
+    def __init__(self, max_bytes=int(PRICE_CACHE_MB * 1024 * 1024), ttl=PRICE_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl.total_seconds()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, symbol, start):
+        # Serie cacheada si cubre desde ``start`` y no ha caducado; None en otro caso
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None or entry["start"] > start or time.monotonic() - entry["loaded_at"] > self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(symbol)
+            self.hits += 1
+            return entry["series"]
+
+    def put(self, symbol, start, series):
+        nbytes = frame_nbytes(series)
+        with self._lock:
+            self._discard(symbol)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[symbol] = {"start": start, "loaded_at": time.monotonic(),
+                                     "series": series, "nbytes": nbytes}
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def sizes(self):
+        # Bytes por símbolo, del más reciente al más antiguo
+        with self._lock:
+            return {symbol: entry["nbytes"] for symbol, entry in reversed(self._entries.items())}
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _discard(self, symbol):
+        entry = self._entries.pop(symbol, None)
+        if entry is not None:
+            self.total_bytes -= entry["nbytes"]
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_frame_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = PriceFrameCache()
+        return _default_cache
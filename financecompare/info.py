@@ -0,0 +1,160 @@
+"""Información de empresa desde Yahoo con caché TTL y revalidación en segundo plano."""
+import os
+import threading
+import time
+from datetime import timedelta
+
+import yfinance as yf
+
+from financecompare.concurrency import SingleFlight, submit_fetch
+from financecompare.session import http_session
+from financecompare.throttle import yahoo_call
+from financecompare.translation import cached_translation
+
+# TTL por grupo de campos: el perfil (sector, descripción...) casi no cambia, la capitalización sí
+PROFILE_TTL = timedelta(minutes=float(os.environ.get("FINANCECOMPARE_PROFILE_TTL_MINUTES", 24 * 60)))
+MARKET_TTL = timedelta(minutes=float(os.environ.get("FINANCECOMPARE_MARKET_TTL_MINUTES", 15)))
+
+
+def fetch_company_profile(symbol):
+    info = yahoo_call(lambda: yf.Ticker(symbol, session=http_session()).info)
+    company_name = info.get("shortName", info.get("longName", symbol))
+    sector = info.get("sector", "Sector no disponible")
+    industry = info.get("industry", "Industria no disponible")
+    country = info.get("country", "País no disponible")
+    # Se guarda el original; la traducción se resuelve al servir la info
+    description = info.get("longBusinessSummary", "Descripción no disponible.")
+
+    return {
+        "symbol": symbol,
+        "name": company_name,
+        "sector": sector,
+        "industry": industry,
+        "country": country,
+        "description": description,
+        "market_cap": info.get("marketCap", "N/A"),
+        "currency": info.get("currency", "N/A")
+    }
+
+
+def fetch_market_cap(symbol):
+    # fast_info es mucho más barato que .info y basta para refrescar la capitalización
+    return yahoo_call(lambda: yf.Ticker(symbol, session=http_session()).fast_info["marketCap"])
+
+
+def format_market_cap(market_cap):
+    if isinstance(market_cap, (int, float)):
+        if market_cap >= 1e12:
+            return f"${market_cap/1e12:.2f}T"
+        elif market_cap >= 1e9:
+            return f"${market_cap/1e9:.2f}B"
+        elif market_cap >= 1e6:
+            return f"${market_cap/1e6:.2f}M"
+    return market_cap
+
+
+class CompanyInfoCache:
+    """Caché en memoria de la info de empresa con TTL por grupo de campos.
+
+    La primera consulta de un símbolo espera a Yahoo. Después, si el perfil o
+    la capitalización caducaron, se devuelve el valor anterior y el refresco se
+    lanza en el pool de fondo (uno por símbolo y grupo a la vez).
+    """
+
+    def __init__(self, profile_ttl=PROFILE_TTL, market_ttl=MARKET_TTL,
+                 fetch_profile=fetch_company_profile, fetch_market=fetch_market_cap,
+                 submit=submit_fetch):
+        self.profile_ttl = profile_ttl.total_seconds()
+        self.market_ttl = market_ttl.total_seconds()
+        self._fetch_profile = fetch_profile
+        self._fetch_market = fetch_market
+        self._submit = submit
+        self._entries = {}
+        self._refreshing = set()
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+
+    def get(self, symbol):
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry is None:
+            # Varias sesiones abriendo el mismo símbolo esperan una única descarga
+            self._update_profile(symbol, self._flights.do(symbol, self._fetch_profile, symbol))
+            with self._lock:
+                entry = self._entries[symbol]
+
+        now = time.monotonic()
+        if now - entry["profile_at"] >= self.profile_ttl:
+            self._schedule(symbol, "profile")
+        elif now - entry["market_at"] >= self.market_ttl:
+            self._schedule(symbol, "market")
+
+        info = dict(entry["profile"])
+        info["market_cap"] = format_market_cap(entry["market_cap"])
+        # Traducción ya guardada o, si aún no existe, el texto original
+        translation = cached_translation(info["description"], "es")
+        info["translated"] = translation is not None
+        if translation is not None:
+            info["description"] = translation
+        return info
+
+    def warm(self, symbol):
+        # Refresco síncrono del perfil y la capitalización (pre-calentado); devuelve el perfil
+        profile = self._flights.do(symbol, self._fetch_profile, symbol)
+        self._update_profile(symbol, profile)
+        return profile
+
+    def flight_stats(self):
+        return self._flights.stats()
+
+    def invalidate(self, symbol=None):
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol, None)
+
+    def _schedule(self, symbol, group):
+        with self._lock:
+            if (symbol, group) in self._refreshing:
+                return
+            self._refreshing.add((symbol, group))
+        self._submit(self._refresh, symbol, group)
+
+    def _refresh(self, symbol, group):
+        try:
+            if group == "profile":
+                self._update_profile(symbol, self._fetch_profile(symbol))
+            else:
+                market_cap = self._fetch_market(symbol)
+                with self._lock:
+                    entry = self._entries.get(symbol)
+                    if entry is not None:
+                        self._entries[symbol] = dict(entry, market_cap=market_cap,
+                                                     market_at=time.monotonic())
+        except Exception:
+            # Se sigue sirviendo el valor anterior; se reintentará en la próxima consulta
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard((symbol, group))
+
+    def _update_profile(self, symbol, profile):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[symbol] = {
+                "profile": profile,
+                "profile_at": now,
+                "market_cap": profile["market_cap"],
+                "market_at": now,
+            }
+
+
+company_info_cache = CompanyInfoCache()
+
+
+def get_company_info(symbol):
+    try:
+        return company_info_cache.get(symbol)
+    except Exception as e:
+        return {"error": f"Error al obtener datos: {str(e)}"}
@@ -0,0 +1,266 @@
+"""Motor de métricas vectorizado sobre una matriz de precios (fechas × símbolos).
+
+Todas las funciones ``*_matrix`` reciben un arreglo 2-D con un símbolo por
+columna (los NaN marcan fechas sin cotización) y devuelven un valor por
+columna en una sola pasada de NumPy, sin bucles por símbolo.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+DAYS_PER_YEAR = 365.25
+# Margen (días) entre la fecha de corte de un horizonte y el primer cierre disponible
+HORIZON_TOLERANCE_DAYS = 7
+
+
+def as_matrix(prices):
+    values = np.asarray(prices, dtype="float64")
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    return values
+
+
+def forward_fill_matrix(values):
+    # Último valor válido de cada columna en cada fila (NaN antes del primero)
+    rows = np.arange(values.shape[0])[:, None]
+    last_valid = np.where(~np.isnan(values), rows, 0)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    return values[last_valid, np.arange(values.shape[1])]
+
+
+def returns_matrix(values):
+    """Rendimientos simples entre observaciones válidas consecutivas de cada columna.
+
+    Equivale a ``pct_change().dropna()`` por serie; la primera fila es NaN.
+    """
+    values = as_matrix(values)
+    returns = np.full(values.shape, np.nan)
+    if values.shape[0] > 1:
+        # Sin huecos no hace falta arrastrar el último valor válido
+        previous = values[:-1] if not np.isnan(values).any() else forward_fill_matrix(values)[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[1:] = values[1:] / previous - 1
+    return returns
+
+
+def cumulative_matrix(returns):
+    # Índice acumulado (1 en el primer precio) a partir de los rendimientos simples
+    return np.cumprod(np.where(np.isnan(returns), 1.0, 1.0 + returns), axis=0)
+
+
+class DerivedSeries:
+    """Series derivadas de una matriz de precios, calculadas una sola vez.
+
+    Los rendimientos simples y el índice acumulado se calculan al primer
+    acceso; quien calcula varias métricas o gráficos de la misma matriz crea
+    una instancia y la pasa a cada uno (``derived=``, solo lectura) en lugar de
+    recalcularlos.
+    """
+
+    def __init__(self, values):
+        self.values = as_matrix(values)
+        self._returns = None
+        self._cumulative = None
+
+    @property
+    def returns(self):
+        if self._returns is None:
+            self._returns = _read_only(returns_matrix(self.values))
+        return self._returns
+
+    @property
+    def cumulative(self):
+        if self._cumulative is None:
+            self._cumulative = _read_only(cumulative_matrix(self.returns))
+        return self._cumulative
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+def cagr_matrix(values, years):
+    # Anualiza por ``years`` nominales: solo válido si la serie cubre todo el periodo
+    values = as_matrix(values)
+    if values.shape[0] == 0:
+        return np.full(values.shape[1], np.nan)
+    valid = ~np.isnan(values)
+    columns = np.arange(values.shape[1])
+    start_price = values[valid.argmax(axis=0), columns]
+    end_price = values[values.shape[0] - 1 - valid[::-1].argmax(axis=0), columns]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return ((end_price / start_price) ** (1 / years) - 1) * 100
+
+
+def cagr_horizons_matrix(dates, values, horizons):
+    """CAGR (%) de varios horizontes en años, una fila por horizonte y una columna por símbolo.
+
+    El precio inicial de cada horizonte se busca por bisección en ``dates``
+    (primer cierre válido desde la fecha de corte) y se anualiza por los días
+    realmente transcurridos hasta el último cierre. Si la serie empieza más de
+    ``HORIZON_TOLERANCE_DAYS`` después del corte, el horizonte no está cubierto
+    y el resultado es NaN.
+    """
+    values = as_matrix(values)
+    rows, width = values.shape
+    result = np.full((len(horizons), width), np.nan)
+    if rows == 0:
+        return result
+
+    days = np.asarray(pd.DatetimeIndex(dates).values.astype("datetime64[D]"), dtype="int64")
+    valid = ~np.isnan(values)
+    columns = np.arange(width)
+    # Próxima fila válida de cada columna desde cada fila (``rows`` si no hay ninguna)
+    next_valid = np.where(valid, np.arange(rows)[:, None], rows)
+    next_valid = np.minimum.accumulate(next_valid[::-1], axis=0)[::-1]
+    last = rows - 1 - valid[::-1].argmax(axis=0)
+    end_price = values[last, columns]
+    end_day = days[last]
+
+    as_of = pd.Timestamp(dates[-1])
+    for i, horizon in enumerate(horizons):
+        cutoff = np.datetime64((as_of - pd.DateOffset(years=horizon)).date(), "D").astype("int64")
+        row = np.searchsorted(days, cutoff, side="left")
+        if row >= rows:
+            continue
+        start = next_valid[row]
+        found = start < rows
+        start = np.minimum(start, rows - 1)
+        start_day = days[start]
+        span = (end_day - start_day) / DAYS_PER_YEAR
+        covered = found & (start_day - cutoff <= HORIZON_TOLERANCE_DAYS) & (span > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cagr = ((end_price / values[start, columns]) ** (1 / span) - 1) * 100
+        result[i] = np.where(covered, cagr, np.nan)
+    return result
+
+
+def volatility_matrix(values, returns=None):
+    returns = returns_matrix(values) if returns is None else returns
+    counts = (~np.isnan(returns)).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nansum(returns, axis=0) / counts
+        variance = np.nansum((returns - mean) ** 2, axis=0) / counts
+    return np.sqrt(variance) * np.sqrt(TRADING_DAYS) * 100
+
+
+def max_drawdown_matrix(values, returns=None, cumulative=None):
+    returns = returns_matrix(values) if returns is None else returns
+    cumulative = cumulative_matrix(returns) if cumulative is None else cumulative
+    # Índice acumulado desde el primer rendimiento; las filas sin rendimiento no cuentan
+    started = np.maximum.accumulate(~np.isnan(returns), axis=0)
+    cumulative = np.where(started, cumulative, 0.0)
+    peak = np.maximum.accumulate(cumulative, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = (cumulative / peak - 1) * 100
+    drawdown[~started] = np.inf
+    worst = drawdown.min(axis=0, initial=np.inf)
+    return np.where(np.isinf(worst), np.nan, worst)
+
+
+def rolling_volatility_matrix(values, windows, returns=None):
+    """Volatilidad rolling anualizada (%) de todas las columnas para varias ventanas.
+
+    Usa sumas acumuladas de los rendimientos (centrados por columna para no
+    perder precisión), así cada ventana cuesta O(n) sin importar su tamaño.
+    Devuelve ``{ventana: matriz}`` con la misma forma que ``values``; como
+    ``rolling(window).std()`` de pandas sobre la serie de cada símbolo, usa
+    ddof=1 y cada ventana son los últimos ``window`` rendimientos válidos de
+    esa columna, aunque otras columnas coticen en fechas distintas. Las filas
+    sin rendimiento propio quedan en NaN.
+    """
+    returns = returns_matrix(values) if returns is None else returns
+    rows, width = returns.shape
+    # La primera fila nunca tiene rendimiento; se trabaja desde la segunda
+    body = returns[1:]
+    valid = ~np.isnan(body)
+    gaps = not valid.all()
+    if gaps:
+        # Cada columna se compacta con sus rendimientos válidos arriba (en orden):
+        # las ventanas se cuentan en observaciones propias y no en filas del calendario común
+        order = np.argsort(~valid, axis=0, kind="stable")
+        body = np.take_along_axis(body, order, axis=0)
+        observations = valid.sum(axis=0)
+        with warnings.catch_warnings():
+            # Columnas sin ningún rendimiento: su media es NaN y se centra en 0
+            warnings.simplefilter("ignore", RuntimeWarning)
+            center = np.nanmean(body, axis=0)
+    else:
+        center = body.mean(axis=0)
+    centered = body - np.nan_to_num(center)
+    if gaps:
+        np.nan_to_num(centered, copy=False)
+
+    sum1 = np.zeros((rows, width))
+    np.cumsum(centered, axis=0, out=sum1[1:])
+    np.square(centered, out=centered)
+    sum2 = np.zeros((rows, width))
+    np.cumsum(centered, axis=0, out=sum2[1:])
+
+    scale = np.sqrt(TRADING_DAYS) * 100
+    result = {}
+    for window in windows:
+        rolling = np.full((rows, width), np.nan)
+        if 1 < window < rows:
+            s1 = sum1[window:] - sum1[:-window]
+            variance = sum2[window:] - sum2[:-window]
+            variance -= s1 * s1 / window
+            variance /= window - 1
+            np.maximum(variance, 0.0, out=variance)
+            np.sqrt(variance, out=variance)
+            variance *= scale
+            rolling[window:] = variance
+        if gaps:
+            # Posiciones compactas más allá de las observaciones de la columna no existen;
+            # se devuelven los resultados a las filas originales de cada rendimiento
+            compact = rolling[1:].copy()
+            compact[np.arange(rows - 1)[:, None] >= observations] = np.nan
+            np.put_along_axis(rolling[1:], order, compact, axis=0)
+        result[window] = rolling
+    return result
+
+
+def metrics_matrix(values, years, dates=None, derived=None):
+    """CAGR, volatilidad anualizada y máximo drawdown de todas las columnas.
+
+    Con ``dates`` el CAGR se anualiza por el tiempo realmente transcurrido y es
+    NaN si la historia no cubre ``years`` (igual que ``cagr_horizons_matrix``);
+    sin fechas se divide por los ``years`` nominales. ``derived`` reutiliza un
+    ``DerivedSeries`` ya creado para ``values``.
+    """
+    derived = derived or DerivedSeries(values)
+    values = derived.values
+    return {
+        "cagr": cagr_matrix(values, years) if dates is None else cagr_horizons_matrix(dates, values, [years])[0],
+        "volatility": volatility_matrix(values, derived.returns),
+        "max_drawdown": max_drawdown_matrix(values, derived.returns, derived.cumulative),
+    }
+
+
+def compute_metrics(prices, years, derived=None):
+    # Versión pandas: una fila por símbolo, una columna por métrica
+    return pd.DataFrame(metrics_matrix(prices.to_numpy(), years, prices.index, derived), index=prices.columns)
+
+
+def compute_cagr_horizons(prices, horizons):
+    # Versión pandas: una fila por horizonte, una columna por símbolo
+    return pd.DataFrame(cagr_horizons_matrix(prices.index, prices.to_numpy(), horizons),
+                        index=list(horizons), columns=prices.columns)
+
+
+def rolling_volatility(prices, windows, derived=None):
+    # Versión pandas: {ventana: DataFrame (fechas × símbolos)}
+    returns = derived.returns if derived is not None else None
+    matrices = rolling_volatility_matrix(prices.to_numpy(), windows, returns)
+    return {window: pd.DataFrame(matrix, index=prices.index, columns=prices.columns)
+            for window, matrix in matrices.items()}
+
+
+def cumulative_frame(prices, derived=None):
+    # Índice acumulado (1 en el primer cierre de cada símbolo), NaN donde no hay precio
+    cumulative = (derived or DerivedSeries(prices.to_numpy())).cumulative
+    return pd.DataFrame(cumulative, index=prices.index, columns=prices.columns).where(prices.notna())
+
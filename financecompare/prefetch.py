@@ -0,0 +1,228 @@
+"""Pre-calentado programado de una lista de seguimiento.
+
+Tras el cierre del mercado descarga precios, info de empresa y traducciones
+de los símbolos configurados y los deja en las mismas cachés que lee la app,
+de modo que la primera consulta del día ya encuentra los datos calientes.
+Los precios pedidos tras el cierre se dan por buenos hasta la apertura
+siguiente, así la app no vuelve a preguntar a Yahoo durante la noche.
+
+Dentro del proceso de la app (``FINANCECOMPARE_WATCHLIST``) se calientan el
+almacén Parquet, la caché de info y el almacén de traducciones. Como comando
+aparte solo se comparten los archivos en disco (precios y traducciones): la
+caché de info vive en la memoria de cada proceso y ahí solo sirve para sacar
+las descripciones que se traducen::
+
+    FINANCECOMPARE_WATCHLIST=AAPL,MSFT,NVDA streamlit run app.py   # hilo dentro del proceso
+    python -m financecompare.prefetch --symbols-file watchlist.txt --at 16:30 17:15
+    python -m financecompare.prefetch AAPL MSFT --once --publish-shared
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from financecompare.bulk_translate import StubTranslator, translate_texts
+from financecompare.compact import load_compact_prices
+from financecompare.info import company_info_cache
+from financecompare.prices import REFRESH_INTERVAL, load_prices_cached, price_dates
+from financecompare.shared import publish_matrix
+
+WATCHLIST = [symbol.strip().upper() for symbol in os.environ.get("FINANCECOMPARE_WATCHLIST", "").split(",")
+             if symbol.strip()]
+# Horas (HH:MM, en PREFETCH_TIMEZONE) de cada ejecución; por defecto, tras el cierre de Nueva York
+PREFETCH_AT = os.environ.get("FINANCECOMPARE_PREFETCH_AT", "16:30").split(",")
+PREFETCH_TIMEZONE = os.environ.get("FINANCECOMPARE_PREFETCH_TIMEZONE", "America/New_York")
+PREFETCH_YEARS = int(os.environ.get("FINANCECOMPARE_PREFETCH_YEARS", "10"))
+# Ritmo máximo hacia Yahoo: símbolos por descarga de precios y pausa entre llamadas
+PREFETCH_CHUNK_SIZE = int(os.environ.get("FINANCECOMPARE_PREFETCH_CHUNK_SIZE", "50"))
+PREFETCH_PAUSE = float(os.environ.get("FINANCECOMPARE_PREFETCH_PAUSE_SECONDS", "0.5"))
+WEEKDAYS = range(5)
+# Horario de la sesión (HH:MM en PREFETCH_TIMEZONE): fuera de él los cierres ya no cambian
+MARKET_OPEN = os.environ.get("FINANCECOMPARE_MARKET_OPEN", "09:30")
+MARKET_CLOSE = os.environ.get("FINANCECOMPARE_MARKET_CLOSE", "16:00")
+
+
+def parse_times(times):
+    return sorted((int(hour), int(minute)) for hour, minute in (t.strip().split(":") for t in times))
+
+
+def next_run(now, times, days=WEEKDAYS):
+    """Próximo instante posterior a ``now`` (con zona horaria) que coincide con ``times`` y ``days``."""
+    for offset in range(8):
+        day = now.date() + timedelta(days=offset)
+        if day.weekday() not in days:
+            continue
+        for hour, minute in times:
+            candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=now.tzinfo)
+            if candidate > now:
+                return candidate
+    raise ValueError("la programación no tiene ninguna ejecución")
+
+
+def fresh_until(now, days=WEEKDAYS, market_open=MARKET_OPEN, market_close=MARKET_CLOSE):
+    """Hasta cuándo valen los precios pedidos en ``now`` (con zona horaria): la próxima apertura.
+
+    Durante la sesión rige el ``REFRESH_INTERVAL`` normal. El resultado es una
+    hora local sin zona, como el resto de fechas del almacén.
+    """
+    (open_hour, open_minute), (close_hour, close_minute) = parse_times([market_open, market_close])
+    local = now.astimezone().replace(tzinfo=None)
+    if now.weekday() in days and (open_hour, open_minute) <= (now.hour, now.minute) < (close_hour, close_minute):
+        return local + REFRESH_INTERVAL
+    return next_run(now, [(open_hour, open_minute)], days).astimezone().replace(tzinfo=None)
+
+
+def warm_watchlist(symbols, years=PREFETCH_YEARS, chunk_size=PREFETCH_CHUNK_SIZE, pause=PREFETCH_PAUSE,
+                   info_cache=company_info_cache, translator=None, target="es", publish_shared=False,
+                   timezone=PREFETCH_TIMEZONE):
+    """Calienta precios, info y traducciones de ``symbols`` respetando el ritmo configurado.
+
+    Devuelve un resumen con los símbolos procesados, los fallos por etapa y la
+    duración; un símbolo que falla no detiene al resto.
+    """
+    started = time.monotonic()
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    valid_until = fresh_until(datetime.now(ZoneInfo(timezone)))
+    report = {"symbols": len(symbols), "fresh_until": valid_until.isoformat(),
+              "price_failures": [], "info_failures": []}
+
+    # 📈 Precios: una descarga por lote, al almacén Parquet y a la caché en memoria; siempre se
+    # pregunta por las barras nuevas y, tras el cierre, valen hasta la apertura siguiente
+    start_date, end_date = price_dates(years)
+    for i in range(0, len(symbols), chunk_size):
+        chunk = symbols[i:i + chunk_size]
+        if i:
+            time.sleep(pause)
+        try:
+            load_prices_cached(chunk, start_date, end_date, fresh_until=valid_until)
+        except Exception:
+            report["price_failures"] += chunk
+
+    # 🏢 Info de empresa: una llamada por símbolo, espaciadas
+    descriptions = []
+    for position, symbol in enumerate(symbols):
+        if position:
+            time.sleep(pause)
+        try:
+            profile = info_cache.warm(symbol)
+        except Exception:
+            report["info_failures"].append(symbol)
+            continue
+        descriptions.append(profile.get("description"))
+
+    # 🌐 Traducciones: por lotes, solo las que aún no están guardadas
+    report["translations"] = translate_texts(descriptions, target=target, translator=translator,
+                                             chunk_interval=max(pause, 1.0))
+
+    if publish_shared:
+        publish_matrix(load_compact_prices(symbols, start_date, end_date), end_date=end_date)
+
+    report["seconds"] = round(time.monotonic() - started, 2)
+    return report
+
+
+class PrefetchScheduler:
+    """Hilo de fondo que ejecuta ``warm_watchlist`` en las horas programadas."""
+
+    def __init__(self, symbols, times=PREFETCH_AT, timezone=PREFETCH_TIMEZONE, days=WEEKDAYS,
+                 run_on_start=False, **warm_options):
+        self.symbols = list(symbols)
+        self.times = parse_times(times)
+        self.timezone = ZoneInfo(timezone)
+        self.days = days
+        self.run_on_start = run_on_start
+        self.warm_options = warm_options
+        self.next_run = None
+        self.last_run = None
+        self.last_report = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="financecompare-prefetch", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self):
+        self.last_report = warm_watchlist(self.symbols, timezone=self.timezone.key, **self.warm_options)
+        self.last_run = datetime.now(self.timezone)
+        return self.last_report
+
+    def _loop(self):
+        if self.run_on_start:
+            self._run_safely()
+        while not self._stop.is_set():
+            now = datetime.now(self.timezone)
+            self.next_run = next_run(now, self.times, self.days)
+            if self._stop.wait((self.next_run - now).total_seconds()):
+                break
+            self._run_safely()
+
+    def _run_safely(self):
+        try:
+            self.run_once()
+        except Exception as e:
+            self.last_report = {"error": str(e)}
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def start_default_scheduler():
+    # Un único programador por proceso, solo si hay lista de seguimiento configurada
+    global _default_scheduler
+    if not WATCHLIST:
+        return None
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = PrefetchScheduler(WATCHLIST).start()
+    return _default_scheduler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-calienta precios, info y traducciones de una lista de seguimiento.")
+    parser.add_argument("symbols", nargs="*", help="Símbolos a calentar (por defecto: FINANCECOMPARE_WATCHLIST)")
+    parser.add_argument("--symbols-file", help="Archivo con un símbolo por línea")
+    parser.add_argument("--at", nargs="+", default=PREFETCH_AT, help="Horas HH:MM de ejecución")
+    parser.add_argument("--timezone", default=PREFETCH_TIMEZONE)
+    parser.add_argument("--every-day", action="store_true", help="Ejecutar también en fin de semana")
+    parser.add_argument("--once", action="store_true", help="Calentar una vez y salir")
+    parser.add_argument("--years", type=int, default=PREFETCH_YEARS)
+    parser.add_argument("--chunk-size", type=int, default=PREFETCH_CHUNK_SIZE)
+    parser.add_argument("--pause", type=float, default=PREFETCH_PAUSE, help="Segundos entre llamadas a Yahoo")
+    parser.add_argument("--publish-shared", action="store_true", help="Publicar también la matriz compartida")
+    parser.add_argument("--stub", action="store_true", help="Usar el traductor local (sin red)")
+    args = parser.parse_args(argv)
+
+    symbols = [symbol.upper() for symbol in args.symbols]
+    if args.symbols_file:
+        with open(args.symbols_file, encoding="utf-8") as handle:
+            symbols += [line.strip().upper() for line in handle if line.strip()]
+    symbols = symbols or list(WATCHLIST)
+    if not symbols:
+        parser.error("indique símbolos, --symbols-file o FINANCECOMPARE_WATCHLIST")
+
+    scheduler = PrefetchScheduler(symbols, times=args.at, timezone=args.timezone,
+                                  days=range(7) if args.every_day else WEEKDAYS,
+                                  years=args.years, chunk_size=args.chunk_size, pause=args.pause,
+                                  translator=StubTranslator() if args.stub else None,
+                                  publish_shared=args.publish_shared)
+    while True:
+        if not args.once:
+            now = datetime.now(scheduler.timezone)
+            wake = next_run(now, scheduler.times, scheduler.days)
+            print(f"Próxima ejecución: {wake:%Y-%m-%d %H:%M %Z}")
+            time.sleep((wake - now).total_seconds())
+        print(json.dumps(scheduler.run_once()))
+        if args.once:
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""Descarga de precios de Yahoo con el almacén local como primera fuente."""
+from datetime import datetime, timedelta
+
+import pandas as pd
+import yfinance as yf
+from yfinance import shared as yf_shared
+from yfinance.exceptions import YFRateLimitError
+
+from financecompare.concurrency import SingleFlight
+from financecompare.framecache import default_frame_cache
+from financecompare.metrics import HORIZON_TOLERANCE_DAYS
+from financecompare.session import http_session
+from financecompare.store import PriceStore, normalize_close, normalize_close_wide
+from financecompare.throttle import is_throttled, yahoo_call, yahoo_throttle
+
+# Tiempo mínimo entre consultas a Yahoo por barras nuevas de un mismo símbolo
+REFRESH_INTERVAL = timedelta(hours=1)
+# Diferencia relativa de cierre a partir de la cual una barra guardada se considera reajustada
+RESTATEMENT_TOLERANCE = 1e-6
+
+# Cargas de precios en curso por (símbolo, inicio, fin), compartidas entre sesiones
+price_flights = SingleFlight()
+
+_default_store = None
+
+
+def default_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore()
+    return _default_store
+
+
+def price_dates(years, today=None):
+    # Años naturales (con bisiestos) más el margen de los horizontes: el corte de
+    # ``years`` años desde el último cierre siempre cae dentro de la descarga
+    end_date = (today or datetime.today()) + timedelta(days=1)  # Incluir día actual
+    start_date = end_date - pd.DateOffset(years=years) - timedelta(days=HORIZON_TOLERANCE_DAYS)
+    return start_date.to_pydatetime(), end_date
+
+
+def slice_price_window(prices, years):
+    # Recorta a los últimos ``years`` años desde el último cierre, el mismo corte que usa el CAGR
+    if prices is None or prices.empty:
+        return prices
+    cutoff = prices.index[-1].normalize() - pd.DateOffset(years=years)
+    return prices.loc[prices.index >= cutoff]
+
+
+def get_historical_prices_batch(symbols, years):
+    # DataFrame ancho (fechas × símbolos) de los últimos ``years`` años
+    return load_prices_cached(symbols, *price_dates(years))
+
+
+def download_prices(symbol, start_date, end_date):
+    # Primero intentar con yf.download
+    try:
+        hist = yahoo_call(_download, symbol, start_date, end_date)
+        if not hist.empty:
+            return normalize_close(hist)
+    except Exception as e:
+        # Con Yahoo limitando el ritmo, la segunda vía solo duplicaría las peticiones
+        if is_throttled(e):
+            raise
+
+    # Si falla, intentar con yf.Ticker
+    hist = yahoo_call(_history, symbol, start_date, end_date)
+    return normalize_close(hist)
+
+
+def download_prices_batch(symbols, start_date, end_date):
+    """Descarga varios símbolos con ``yf.download``, en tramos que caben en la ráfaga del limitador.
+
+    Devuelve un DataFrame ancho (fechas × símbolos) alineado por fecha.
+    yfinance lanza a la vez una petición por símbolo: cada tramo reserva un
+    token por símbolo y no pasa de ``YAHOO_BURST`` símbolos, así las peticiones
+    simultáneas nunca superan la ráfaga permitida.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+    size = max(1, int(yahoo_throttle.bucket.burst))
+    chunks = []
+    for i in range(0, len(symbols), size):
+        chunk = symbols[i:i + size]
+        hist = yahoo_call(_download, chunk, start_date, end_date, tokens=len(chunk))
+        chunks.append(normalize_close_wide(hist, chunk))
+    return pd.concat(chunks, axis=1).sort_index() if len(chunks) > 1 else chunks[0]
+
+
+def _download(symbols, start_date, end_date):
+    # yf.download no lanza: anota los fallos por símbolo; un 429 se convierte en excepción para reintentar
+    hist = yf.download(symbols, start=start_date, end=end_date, progress=False, session=http_session())
+    errors = getattr(yf_shared, "_ERRORS", None) or {}
+    if any(is_throttled(error) for error in errors.values()):
+        raise YFRateLimitError()
+    return hist
+
+
+def _history(symbol, start_date, end_date):
+    return yf.Ticker(symbol, session=http_session()).history(start=start_date, end=end_date)
+
+
+def load_prices_batch(symbols, start_date, end_date, store=None, fresh_until=None):
+    """Como ``load_prices`` para varios símbolos, con un único viaje a Yahoo.
+
+    Los tramos que falten en el almacén se piden juntos en una descarga por
+    lotes; cada símbolo se resuelve después contra esa descarga. Devuelve un
+    DataFrame ancho (fechas × símbolos).
+    """
+    store = store or default_store()
+    symbols = list(dict.fromkeys(symbols))
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize()
+    now = datetime.now()
+
+    pending = {}
+    for symbol in symbols:
+        fetch_from = _pending_fetch(symbol, start, end, store, now, fresh_until)
+        if fetch_from is not None:
+            pending[symbol] = fetch_from
+
+    batch = None
+    batch_start = None
+    throttled = None
+    if pending:
+        batch_start = min(pending.values())
+        try:
+            batch = download_prices_batch(list(pending), batch_start, end)
+        except Exception as e:
+            batch = None
+            if is_throttled(e):
+                throttled = e
+
+    def fetch(symbol, fetch_start, fetch_end):
+        # Recorta la descarga por lotes; si no cubre lo pedido, descarga individual
+        if batch is not None and symbol in batch and fetch_start >= batch_start:
+            column = batch[symbol].loc[fetch_start:fetch_end - timedelta(days=1)].dropna()
+            if not column.empty:
+                return column.to_frame("Close")
+        if throttled is not None:
+            # Yahoo ya limitó el lote tras agotar los reintentos: una descarga por símbolo
+            # multiplicaría las peticiones; se sirve lo que haya en disco o se falla
+            raise throttled
+        return download_prices(symbol, fetch_start, fetch_end)
+
+    columns = {symbol: load_prices(symbol, start, end, store=store, fetch=fetch, fresh_until=fresh_until)["Close"]
+               for symbol in symbols}
+    wide = pd.DataFrame(columns)
+    wide.index.name = "Date"
+    return wide
+
+
+def load_prices_cached(symbols, start_date, end_date, cache=None, store=None, fresh_until=None):
+    """``load_prices_batch`` con la caché en memoria de series por símbolo delante.
+
+    Solo los símbolos ausentes (o con menos historia de la pedida) van al
+    almacén y, si hace falta, a Yahoo, todos en una única descarga por lotes;
+    los que otra petición ya está cargando se esperan en lugar de repetirse.
+    Con ``fresh_until`` (pre-calentado) se recargan todos, sin mirar la caché.
+    """
+    cache = cache or default_frame_cache()
+    symbols = list(dict.fromkeys(symbols))
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize()
+
+    series = {}
+    missing = []
+    for symbol in symbols:
+        cached = cache.get(symbol, start) if fresh_until is None else None
+        if cached is None:
+            missing.append(symbol)
+        else:
+            series[symbol] = cached
+    if missing:
+        # Sesiones simultáneas que piden el mismo símbolo comparten una única carga
+        def load(keys):
+            loaded = load_prices_batch([symbol for symbol, _, _ in keys], start, end, store=store,
+                                       fresh_until=fresh_until)
+            columns = {}
+            for key in keys:
+                column = loaded[key[0]].dropna()
+                cache.put(key[0], start, column)
+                columns[key] = column
+            return columns
+
+        loaded = price_flights.do_many([(symbol, start, end) for symbol in missing], load)
+        series.update({symbol: column for (symbol, _, _), column in loaded.items()})
+
+    wide = pd.DataFrame({symbol: series[symbol].loc[start:end - timedelta(days=1)] for symbol in symbols})
+    wide.index.name = "Date"
+    return wide
+
+
+def load_prices(symbol, start_date, end_date, store=None, fetch=download_prices, fresh_until=None):
+    """Devuelve los cierres de ``[start_date, end_date)`` leyendo del almacén.
+
+    Solo se piden a ``fetch`` los tramos que faltan: el inicio anterior a lo ya
+    cubierto y, como mucho una vez cada ``REFRESH_INTERVAL``, las barras desde
+    la penúltima guardada. La última es provisional (puede ser la barra en vivo
+    de la sesión en curso) y se sobrescribe sin más; la penúltima ya es un
+    cierre definitivo y sirve para detectar reajustes (splits o dividendos):
+    si cambió se recarga todo el histórico, si no las barras nuevas se añaden
+    sin reescribir la base.
+
+    ``fresh_until`` fuerza esa comprobación y la da por buena hasta esa fecha
+    en lugar de ``REFRESH_INTERVAL`` (el pre-calentado tras el cierre la
+    mantiene hasta la apertura siguiente).
+    """
+    store = store or default_store()
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize()
+    now = datetime.now()
+
+    cached = store.read(symbol)
+    meta = store.read_meta(symbol)
+    covered_from = pd.Timestamp(meta["covered_from"]) if meta.get("covered_from") else None
+
+    if cached is None or covered_from is None:
+        history = fetch(symbol, start, end)
+        store.write(symbol, history, _meta(start, now, fresh_until))
+        return history.loc[start:end - timedelta(days=1)]
+
+    history = cached
+    if start < covered_from:
+        head = fetch(symbol, start, covered_from)
+        history = _combine(head, history)
+        covered_from = start
+        store.write(symbol, history, dict(meta, covered_from=covered_from.isoformat()))
+
+    if _needs_refresh(meta, now, fresh_until):
+        anchor, last = _refresh_range(history, covered_from)
+        if last < end:
+            try:
+                tail = fetch(symbol, anchor, end)
+            except Exception:
+                # Sin conexión: se sirve lo que ya está en disco
+                tail = None
+            if tail is not None:
+                if find_restated(history.loc[history.index < last], tail).empty:
+                    # La barra provisional se guarda de nuevo en el delta y la nueva prevalece al leer
+                    store.append(symbol, tail.loc[tail.index >= last], _meta(covered_from, now, fresh_until))
+                    history = _combine(history, tail)
+                else:
+                    history = fetch(symbol, covered_from, end)
+                    store.write(symbol, history, _meta(covered_from, now, fresh_until))
+
+    return history.loc[start:end - timedelta(days=1)]
+
+
+def revalidate_prices(symbol, store=None, fetch=download_prices):
+    """Vuelve a descargar todo lo cubierto y corrige las barras reajustadas.
+
+    Devuelve las fechas cuyo cierre cambió (vacío si el almacén ya estaba al día).
+    """
+    store = store or default_store()
+    cached = store.read(symbol)
+    meta = store.read_meta(symbol)
+    if cached is None or not meta.get("covered_from"):
+        return pd.DatetimeIndex([], name="Date")
+    covered_from = pd.Timestamp(meta["covered_from"])
+    now = datetime.now()
+    fresh = fetch(symbol, covered_from, pd.Timestamp(now).normalize() + timedelta(days=1))
+    restated = find_restated(cached, fresh)
+    if not restated.empty or not fresh.index.equals(cached.index):
+        store.write(symbol, fresh, _meta(covered_from, now))
+    return restated
+
+
+def _pending_fetch(symbol, start, end, store, now, fresh_until=None):
+    # Fecha desde la que load_prices tendría que ir a Yahoo, o None si basta el almacén
+    meta = store.read_meta(symbol)
+    if not meta.get("covered_from"):
+        return start
+    covered_from = pd.Timestamp(meta["covered_from"])
+    fetch_from = start if start < covered_from else None
+    if _needs_refresh(meta, now, fresh_until):
+        cached = store.read(symbol)
+        if cached is None:
+            return start
+        anchor, last = _refresh_range(cached, covered_from)
+        if last < end:
+            fetch_from = anchor if fetch_from is None else fetch_from
+    return fetch_from
+
+
+def _refresh_range(history, covered_from):
+    # (desde dónde pedir la cola, última barra guardada): la penúltima barra es la referencia
+    # para detectar reajustes porque la última puede ser la barra en vivo de la sesión
+    if history.empty:
+        return covered_from, covered_from
+    return history.index[max(len(history) - 2, 0)], history.index[-1]
+
+
+def find_restated(cached, fresh, tolerance=RESTATEMENT_TOLERANCE):
+    # Fechas presentes en ambos lados cuyo cierre difiere más que la tolerancia relativa
+    common = cached.index.intersection(fresh.index)
+    old = cached.loc[common, "Close"]
+    new = fresh.loc[common, "Close"]
+    changed = (new - old).abs() > tolerance * old.abs()
+    return common[changed.to_numpy()]
+
+
+def _combine(older, newer):
+    history = pd.concat([older, newer])
+    return history[~history.index.duplicated(keep="last")].sort_index()
+
+
+def _needs_refresh(meta, now, fresh_until=None):
+    # ¿Toca preguntar a Yahoo por barras nuevas? Un pre-calentado (``fresh_until``) siempre pregunta
+    if fresh_until is not None or not meta.get("checked_at"):
+        return True
+    if meta.get("fresh_until") and now < datetime.fromisoformat(meta["fresh_until"]):
+        return False
+    return now - datetime.fromisoformat(meta["checked_at"]) >= REFRESH_INTERVAL
+
+
+def _meta(covered_from, checked_at, fresh_until=None):
+    return {"covered_from": covered_from.isoformat(),
+            "checked_at": checked_at.isoformat() if checked_at else None,
+            "fresh_until": fresh_until.isoformat() if fresh_until else None}
@@ -0,0 +1,188 @@
+"""Sesión HTTP compartida (keep-alive) para Yahoo y el traductor, con tiempos por llamada.
+
+Todas las llamadas salen por un único ``requests.Session`` con un pool de
+conexiones persistentes: la resolución DNS y el apretón TLS se pagan una vez
+por conexión y no en cada petición. Cada respuesta lleva ``response.timings``
+(DNS, conexión TCP, TLS y total en ms; ceros si la conexión se reutilizó) y
+``http_stats`` acumula los mismos tiempos para la interfaz y la API.
+"""
+import os
+import socket
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import allowed_gai_family
+
+# Conexiones persistentes por host y tiempos de espera por defecto (segundos)
+HTTP_POOL_SIZE = int(os.environ.get("FINANCECOMPARE_HTTP_POOL_SIZE", "16"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("FINANCECOMPARE_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.environ.get("FINANCECOMPARE_HTTP_READ_TIMEOUT", "30"))
+RECENT_CALLS = 100
+
+_local = threading.local()
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """Conexión que mide la resolución DNS y el connect TCP de cada conexión nueva."""
+
+    def _new_conn(self):
+        timings = _current_timings()
+        host = self._dns_host
+        started = time.perf_counter()
+        try:
+            # Se resuelve aquí para medir el DNS por separado y se conecta a la IP ya resuelta
+            address = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)[0][4][0]
+        except OSError:
+            address = None
+        resolved = time.perf_counter()
+        timings["dns_ms"] += (resolved - started) * 1000
+
+        try:
+            if address is not None:
+                self._dns_host = address
+            try:
+                sock = super()._new_conn()
+            except OSError:
+                if address is None:
+                    raise
+                # Si la primera IP no responde, urllib3 prueba todas las del host
+                self._dns_host = host
+                sock = super()._new_conn()
+        finally:
+            self._dns_host = host
+        timings["connect_ms"] += (time.perf_counter() - resolved) * 1000
+        timings["new_connections"] += 1
+        return sock
+
+
+class TimedHTTPSConnection(TimedHTTPConnection, HTTPSConnection):
+    """Además del DNS y el TCP, mide el apretón TLS."""
+
+    def connect(self):
+        timings = _current_timings()
+        before = timings["dns_ms"] + timings["connect_ms"]
+        started = time.perf_counter()
+        super().connect()
+        elapsed = (time.perf_counter() - started) * 1000
+        timings["tls_ms"] += max(0.0, elapsed - (timings["dns_ms"] + timings["connect_ms"] - before))
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """Adaptador con pool persistente, timeout por defecto y registro de tiempos por llamada."""
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), stats=None):
+        self.timeout = timeout
+        self.stats = stats or HttpStats()
+        # Sin reintentos aquí: los 429 y fallos transitorios los gestiona financecompare.throttle
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+    def send(self, request, timeout=None, **kwargs):
+        _local.timings = timings = _empty_timings()
+        started = time.perf_counter()
+        try:
+            response = super().send(request, timeout=timeout or self.timeout, **kwargs)
+        finally:
+            timings["total_ms"] = (time.perf_counter() - started) * 1000
+            _local.timings = None
+            self.stats.record(urlsplit(request.url).hostname, timings)
+        response.timings = {name: round(value, 2) if name.endswith("_ms") else value
+                            for name, value in timings.items()}
+        return response
+
+
+class HttpStats:
+    """Tiempos acumulados y últimas llamadas de la sesión compartida."""
+
+    def __init__(self, recent=RECENT_CALLS):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=recent)
+        self.requests = 0
+        self.new_connections = 0
+        self.dns_ms = 0.0
+        self.connect_ms = 0.0
+        self.tls_ms = 0.0
+        self.total_ms = 0.0
+
+    def record(self, host, timings):
+        with self._lock:
+            self.requests += 1
+            self.new_connections += timings["new_connections"]
+            self.dns_ms += timings["dns_ms"]
+            self.connect_ms += timings["connect_ms"]
+            self.tls_ms += timings["tls_ms"]
+            self.total_ms += timings["total_ms"]
+            self._recent.append({"host": host, **{name: round(value, 2) for name, value in timings.items()}})
+
+    def recent(self):
+        with self._lock:
+            return list(self._recent)
+
+    def summary(self):
+        with self._lock:
+            connections = max(self.new_connections, 1)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused": self.requests - min(self.new_connections, self.requests),
+                "avg_dns_ms": round(self.dns_ms / connections, 2),
+                "avg_connect_ms": round(self.connect_ms / connections, 2),
+                "avg_tls_ms": round(self.tls_ms / connections, 2),
+                "avg_total_ms": round(self.total_ms / max(self.requests, 1), 2),
+            }
+
+
+def _empty_timings():
+    return {"new_connections": 0, "dns_ms": 0.0, "connect_ms": 0.0, "tls_ms": 0.0, "total_ms": 0.0}
+
+
+def _current_timings():
+    # Conexiones abiertas fuera de una llamada registrada se miden sin acumularse
+    timings = getattr(_local, "timings", None)
+    return timings if timings is not None else _empty_timings()
+
+
+def make_session(pool_size=HTTP_POOL_SIZE, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), stats=None):
+    session = requests.Session()
+    adapter = PooledAdapter(pool_size=pool_size, timeout=timeout, stats=stats)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def http_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+
+def http_stats():
+    return http_session().get_adapter("https://").stats.summary()
+
+
+def recent_http_calls():
+    return http_session().get_adapter("https://").stats.recent()
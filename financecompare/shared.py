@@ -0,0 +1,167 @@
+"""Matriz de precios compartida entre procesos mediante archivos mapeados en memoria.
+
+Un proceso de fondo descarga el universo y publica la matriz compacta
+(calendario ``int32`` + cierres ``float32``) como ``.npy``; cada worker de
+Streamlit la abre con ``mmap_mode="r"``, así todos comparten las mismas páginas
+de la caché del sistema operativo en lugar de tener una copia cada uno. Cada
+lectura copia a ``float64`` solo las fechas y símbolos pedidos::
+
+    python -m financecompare.shared --symbols-file universo.txt --years 10 --interval 3600
+"""
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from financecompare.compact import EPOCH, CompactPrices, load_compact_prices
+from financecompare.prices import REFRESH_INTERVAL, price_dates
+from financecompare.store import atomic_write
+
+DEFAULT_SHARED_DIR = Path(os.environ.get(
+    "FINANCECOMPARE_SHARED_DIR",
+    Path.home() / ".cache" / "financecompare" / "shared",
+))
+# Una publicación más antigua que esto se ignora y se pasa por el almacén; por defecto, el
+# mismo intervalo con el que el almacén vuelve a pedir las barras nuevas
+SHARED_MAX_AGE = timedelta(hours=float(os.environ.get("FINANCECOMPARE_SHARED_MAX_AGE_HOURS",
+                                                      str(REFRESH_INTERVAL / timedelta(hours=1)))))
+CURRENT_FILE = "CURRENT"
+# Versiones anteriores que se conservan para los lectores que aún las tienen mapeadas
+KEEP_VERSIONS = 2
+
+
+def publish_matrix(prices, root=DEFAULT_SHARED_DIR, end_date=None):
+    """Escribe una nueva versión de la matriz y la marca como vigente de forma atómica.
+
+    ``end_date`` es el final (exclusivo) de la descarga publicada; sin él se toma
+    el día siguiente a la última fecha de la matriz.
+    """
+    root = Path(root)
+    version = f"v{time.time_ns()}"
+    directory = root / version
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "calendar.npy", prices.days)
+    np.save(directory / "closes.npy", prices.closes)
+    if end_date is None:
+        end_date = prices.dates[-1] + timedelta(days=1) if len(prices.days) else datetime.now()
+    (directory / "meta.json").write_text(json.dumps({
+        "symbols": prices.symbols,
+        "covered_to": pd.Timestamp(end_date).date().isoformat(),
+        "published_at": datetime.now().isoformat(),
+    }))
+    atomic_write(root / CURRENT_FILE, lambda tmp: Path(tmp).write_text(version))
+
+    versions = sorted(path for path in root.glob("v*") if path.is_dir())
+    for stale in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(stale, ignore_errors=True)
+    return directory
+
+
+class SharedPriceMatrix:
+    """Lector de la matriz publicada; se vuelve a mapear cuando cambia la versión."""
+
+    def __init__(self, root=DEFAULT_SHARED_DIR, max_age=SHARED_MAX_AGE):
+        self.root = Path(root)
+        self.max_age = max_age
+        self._version = None
+        self._prices = None
+        self._published_at = None
+        self._covered_to = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        # CompactPrices sobre los archivos mapeados (solo lectura) o None si no hay publicación vigente
+        return self._load()[0]
+
+    def _load(self):
+        try:
+            version = (self.root / CURRENT_FILE).read_text().strip()
+        except OSError:
+            return None, None
+        with self._lock:
+            if version != self._version:
+                directory = self.root / version
+                try:
+                    meta = json.loads((directory / "meta.json").read_text())
+                    days = np.load(directory / "calendar.npy", mmap_mode="r")
+                    closes = np.load(directory / "closes.npy", mmap_mode="r")
+                except (OSError, ValueError):
+                    return None, None
+                self._prices = CompactPrices(days, meta["symbols"], closes)
+                self._published_at = datetime.fromisoformat(meta["published_at"])
+                # Día (desde 1970-01-01) en que termina la descarga publicada, exclusivo
+                if meta.get("covered_to"):
+                    self._covered_to = int((np.datetime64(meta["covered_to"], "D") - EPOCH).astype("int32"))
+                else:
+                    self._covered_to = int(days[-1]) + 1 if len(days) else None
+                self._version = version
+            if datetime.now() - self._published_at > self.max_age:
+                return None, None
+            return self._prices, self._covered_to
+
+    def get(self, symbols, start_date, end_date):
+        """Cierres de ``[start_date, end_date)`` como DataFrame ancho, o None si la matriz no los cubre."""
+        prices, covered_to = self._load()
+        if prices is None or any(symbol not in prices.symbols for symbol in symbols):
+            return None
+        start = (np.datetime64(pd.Timestamp(start_date).date(), "D") - EPOCH).astype("int32")
+        end = (np.datetime64(pd.Timestamp(end_date).date(), "D") - EPOCH).astype("int32")
+        if not len(prices.days) or prices.days[0] > start + 7:
+            return None
+        # Una publicación de ayer no tiene las barras de hoy: mejor el almacén, que sí las pide
+        if covered_to is None or end > covered_to:
+            return None
+        first, last = np.searchsorted(prices.days, [start, end], side="left")
+        columns = [prices.symbols.index(symbol) for symbol in symbols]
+        # Copia solo el tramo pedido (fechas × símbolos) a float64; la matriz mapeada no se toca
+        wide = pd.DataFrame(prices.closes[first:last, columns].astype("float64"),
+                            index=prices.dates[first:last], columns=list(symbols))
+        return wide.dropna(how="all")
+
+
+_default_matrix = None
+
+
+def default_shared_matrix():
+    global _default_matrix
+    if _default_matrix is None:
+        _default_matrix = SharedPriceMatrix()
+    return _default_matrix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publica la matriz de precios compartida.")
+    parser.add_argument("symbols", nargs="*", help="Símbolos a publicar")
+    parser.add_argument("--symbols-file", help="Archivo con un símbolo por línea")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Segundos entre publicaciones (0: publicar una vez y salir)")
+    parser.add_argument("--root", default=str(DEFAULT_SHARED_DIR))
+    args = parser.parse_args(argv)
+
+    symbols = [symbol.upper() for symbol in args.symbols]
+    if args.symbols_file:
+        with open(args.symbols_file, encoding="utf-8") as handle:
+            symbols += [line.strip().upper() for line in handle if line.strip()]
+    if not symbols:
+        parser.error("indique símbolos o --symbols-file")
+
+    while True:
+        start_date, end_date = price_dates(args.years)
+        prices = load_compact_prices(symbols, start_date, end_date)
+        directory = publish_matrix(prices, args.root, end_date)
+        print(f"{datetime.now():%Y-%m-%d %H:%M:%S} {len(prices.symbols)} símbolos → {directory}")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
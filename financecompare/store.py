@@ -0,0 +1,153 @@
+"""Almacén local de históricos de precios en Parquet, un directorio por símbolo."""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_STORE_DIR = Path(os.environ.get(
+    "FINANCECOMPARE_STORE_DIR",
+    Path.home() / ".cache" / "financecompare" / "prices",
+))
+
+
+class PriceStore:
+    """Guarda una serie de cierres por símbolo con su metadata de cobertura.
+
+    Cada símbolo vive en ``<root>/<símbolo>/`` con ``history.parquet`` (índice
+    ``Date`` sin zona horaria y columna ``Close``), los tramos añadidos después
+    como ``delta-*.parquet`` y ``meta.json``. Las escrituras son atómicas para
+    que varios procesos puedan compartir el directorio sin leer archivos a
+    medio escribir.
+    """
+
+    HISTORY_FILE = "history.parquet"
+    META_FILE = "meta.json"
+    DELTA_GLOB = "delta-*.parquet"
+    # Número de deltas a partir del cual se compactan en history.parquet
+    COMPACT_AFTER = 20
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = Path(root)
+
+    def symbol_dir(self, symbol):
+        return self.root / quote(symbol.upper(), safe="")
+
+    def read(self, symbol):
+        directory = self.symbol_dir(symbol)
+        path = directory / self.HISTORY_FILE
+        if not path.exists():
+            return None
+        frames = [pq.read_table(path).to_pandas()]
+        frames += [pq.read_table(delta).to_pandas() for delta in self._deltas(directory)]
+        if len(frames) == 1:
+            return frames[0]
+        history = pd.concat(frames)
+        return history[~history.index.duplicated(keep="last")].sort_index()
+
+    def read_meta(self, symbol):
+        path = self.symbol_dir(symbol) / self.META_FILE
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text())
+        except ValueError:
+            return {}
+
+    def write(self, symbol, frame, meta):
+        # Reescritura completa: sustituye la base y descarta los deltas
+        directory = self.symbol_dir(symbol)
+        directory.mkdir(parents=True, exist_ok=True)
+        stale = self._deltas(directory)
+        _write_parquet(directory / self.HISTORY_FILE, frame)
+        for delta in stale:
+            delta.unlink(missing_ok=True)
+        self.write_meta(symbol, meta)
+
+    def append(self, symbol, frame, meta):
+        # Solo añade las barras nuevas; la base existente no se toca
+        directory = self.symbol_dir(symbol)
+        if not frame.empty:
+            name = f"delta-{datetime.now():%Y%m%d%H%M%S%f}-{os.getpid()}.parquet"
+            _write_parquet(directory / name, frame)
+            if len(self._deltas(directory)) >= self.COMPACT_AFTER:
+                self.write(symbol, self.read(symbol), meta)
+                return
+        self.write_meta(symbol, meta)
+
+    def write_meta(self, symbol, meta):
+        directory = self.symbol_dir(symbol)
+        directory.mkdir(parents=True, exist_ok=True)
+        atomic_write(directory / self.META_FILE,
+                      lambda tmp: Path(tmp).write_text(json.dumps(meta)))
+
+    def clear(self, symbol):
+        directory = self.symbol_dir(symbol)
+        for path in [directory / self.HISTORY_FILE, directory / self.META_FILE,
+                     *self._deltas(directory)]:
+            path.unlink(missing_ok=True)
+
+    def _deltas(self, directory):
+        return sorted(directory.glob(self.DELTA_GLOB))
+
+
+def _write_parquet(path, frame):
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    atomic_write(path, lambda tmp: pq.write_table(table, tmp))
+
+
+def atomic_write(path, writer):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        writer(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def normalize_close(hist):
+    # yfinance devuelve columnas MultiIndex y fechas con zona horaria según la ruta
+    if hist is None or hist.empty or "Close" not in hist:
+        return empty_close()
+    close = hist["Close"]
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    index = pd.DatetimeIndex(close.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame = pd.DataFrame({"Close": close.to_numpy(dtype="float64")},
+                         index=index.normalize())
+    frame.index.name = "Date"
+    frame = frame[~frame.index.duplicated(keep="last")]
+    return frame.dropna().sort_index()
+
+
+def normalize_close_wide(hist, symbols):
+    # Cierres de una descarga multi-símbolo como columnas, una por símbolo
+    index = pd.DatetimeIndex([], name="Date")
+    if hist is None or hist.empty or "Close" not in hist:
+        return pd.DataFrame(columns=symbols, index=index, dtype="float64")
+    close = hist["Close"]
+    if isinstance(close, pd.Series):
+        close = close.to_frame(symbols[0])
+    close = close.reindex(columns=symbols).astype("float64")
+    index = pd.DatetimeIndex(close.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    close.index = index.normalize()
+    close.index.name = "Date"
+    close.columns.name = None
+    close = close[~close.index.duplicated(keep="last")]
+    return close.dropna(how="all").sort_index()
+
+
+def empty_close():
+    frame = pd.DataFrame({"Close": pd.Series(dtype="float64")},
+                         index=pd.DatetimeIndex([], name="Date"))
+    return frame
@@ -0,0 +1,78 @@
+"""Acumuladores incrementales de volatilidad y drawdown.
+
+Para un panel en vivo o un proceso largo que recibe barras de una en una:
+cada ``update`` cuesta O(1) por símbolo en lugar de recalcular toda la
+historia. Los resultados coinciden con la volatilidad y el máximo drawdown
+de ``compute_metrics`` sobre la misma matriz.
+"""
+import numpy as np
+
+from financecompare.metrics import TRADING_DAYS, DerivedSeries, max_drawdown_matrix
+
+
+class StreamingMetrics:
+    """Volatilidad (varianza de Welford) y máximo drawdown para N columnas a la vez.
+
+    ``update`` recibe un precio por columna; un NaN indica que ese símbolo no
+    cotizó en la barra y su estado no cambia.
+    """
+
+    def __init__(self, width=1):
+        self.last_price = np.full(width, np.nan)
+        self.count = np.zeros(width, dtype="int64")
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.peak = np.full(width, np.nan)
+        self.worst = np.full(width, np.nan)
+
+    @classmethod
+    def from_history(cls, prices):
+        # Estado inicial a partir de una matriz (fechas × símbolos), en una pasada vectorizada
+        derived = DerivedSeries(prices)
+        values, returns = derived.values, derived.returns
+        state = cls(values.shape[1])
+        has_return = ~np.isnan(returns)
+        state.count = has_return.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            state.mean = np.where(state.count > 0, np.nansum(returns, axis=0) / state.count, 0.0)
+            state.m2 = np.nansum((returns - state.mean) ** 2, axis=0)
+        started = np.maximum.accumulate(has_return, axis=0)
+        state.peak = np.where(started & ~np.isnan(values), values, -np.inf).max(axis=0, initial=-np.inf)
+        state.peak[np.isinf(state.peak)] = np.nan
+        state.worst = max_drawdown_matrix(values, returns, derived.cumulative) / 100
+        valid = ~np.isnan(values)
+        if values.shape[0]:
+            last = values.shape[0] - 1 - valid[::-1].argmax(axis=0)
+            state.last_price = np.where(valid.any(axis=0), values[last, np.arange(values.shape[1])], np.nan)
+        return state
+
+    def update(self, prices):
+        prices = np.asarray(prices, dtype="float64").reshape(-1)
+        valid = ~np.isnan(prices)
+        step = valid & ~np.isnan(self.last_price)
+
+        # Welford sobre el rendimiento de la barra
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = np.where(step, prices / self.last_price - 1, 0.0)
+        self.count = self.count + step
+        delta = ret - self.mean
+        self.mean = np.where(step, self.mean + delta / np.maximum(self.count, 1), self.mean)
+        self.m2 = np.where(step, self.m2 + delta * (ret - self.mean), self.m2)
+
+        # Pico y peor caída desde el primer rendimiento, como max_drawdown_matrix
+        self.peak = np.where(step, np.fmax(self.peak, prices), self.peak)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = prices / self.peak - 1
+        self.worst = np.where(step, np.fmin(self.worst, drawdown), self.worst)
+
+        self.last_price = np.where(valid, prices, self.last_price)
+
+    @property
+    def volatility(self):
+        # Anualizada en %, con ddof=0 como np.std
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(self.m2 / self.count) * np.sqrt(TRADING_DAYS) * 100
+
+    @property
+    def max_drawdown(self):
+        return self.worst * 100
@@ -0,0 +1,162 @@
+"""Límite de ritmo y reintentos con espera exponencial para todas las llamadas a Yahoo.
+
+Un único cubo de tokens por proceso reparte el ritmo permitido entre todas las
+sesiones, el pool de fondo y el pre-calentado. Cuando Yahoo responde con un
+429 se reintenta con espera exponencial y jitter (tenacity) y el ritmo del cubo
+se reduce a la mitad; cada llamada correcta lo recupera poco a poco hasta el
+máximo configurado, así el proceso se mantiene cerca del límite sin encadenar 429.
+"""
+import os
+import threading
+import time
+
+import requests
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+from yfinance.exceptions import YFRateLimitError
+
+# Peticiones por segundo hacia Yahoo en todo el proceso y ráfaga máxima
+YAHOO_RATE = float(os.environ.get("FINANCECOMPARE_YAHOO_RATE", "2"))
+YAHOO_BURST = float(os.environ.get("FINANCECOMPARE_YAHOO_BURST", "5"))
+YAHOO_MAX_ATTEMPTS = int(os.environ.get("FINANCECOMPARE_YAHOO_MAX_ATTEMPTS", "5"))
+YAHOO_BACKOFF_MAX = float(os.environ.get("FINANCECOMPARE_YAHOO_BACKOFF_MAX_SECONDS", "30"))
+# Suelo del ritmo adaptativo (fracción de YAHOO_RATE) y recuperación por llamada correcta
+MIN_RATE_FRACTION = 0.1
+RECOVERY_FRACTION = 0.05
+
+THROTTLE_MARKERS = ("Too Many Requests", "Rate limited")
+
+
+class TokenBucket:
+    """Cubo de tokens seguro entre hilos con ritmo ajustable.
+
+    ``acquire`` reserva los tokens bajo el lock y duerme fuera de él: las
+    esperas se encolan en orden de llegada y nadie se adelanta a una reserva.
+    """
+
+    def __init__(self, rate=YAHOO_RATE, burst=YAHOO_BURST):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self, tokens=1):
+        # Un lote mayor que la ráfaga se reserva igualmente: el déficit lo pagan las siguientes llamadas
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if delay:
+                self.waits += 1
+                self.waited_seconds += delay
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def slow_down(self):
+        with self._lock:
+            self._refill()
+            self.rate = max(self.rate / 2, self.max_rate * MIN_RATE_FRACTION)
+
+    def recover(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill()
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_FRACTION)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class YahooThrottle:
+    """Cubo de tokens + reintentos de tenacity, con contadores para la interfaz y la API."""
+
+    def __init__(self, bucket=None, max_attempts=YAHOO_MAX_ATTEMPTS, backoff_max=YAHOO_BACKOFF_MAX,
+                 sleep=time.sleep):
+        self.bucket = bucket or TokenBucket()
+        self.max_attempts = max_attempts
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+        self.backoff_seconds = 0.0
+
+    def call(self, fn, *args, tokens=1, **kwargs):
+        """Ejecuta ``fn`` respetando el ritmo; reintenta 429 y fallos de red transitorios."""
+        retrying = Retrying(
+            retry=retry_if_exception(is_retryable),
+            wait=wait_random_exponential(multiplier=0.5, max=self.backoff_max),
+            stop=stop_after_attempt(self.max_attempts),
+            before_sleep=self._before_sleep,
+            sleep=self._sleep,
+            reraise=True,
+        )
+        try:
+            for attempt in retrying:
+                with attempt:
+                    self.bucket.acquire(tokens)
+                    self._count("calls")
+                    try:
+                        result = fn(*args, **kwargs)
+                    except Exception as e:
+                        if is_throttled(e):
+                            self._count("throttled")
+                            self.bucket.slow_down()
+                        raise
+        except Exception:
+            self._count("failures")
+            raise
+        self.bucket.recover()
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "failures": self.failures,
+                "backoff_seconds": round(self.backoff_seconds, 2),
+                "rate_waits": self.bucket.waits,
+                "rate_wait_seconds": round(self.bucket.waited_seconds, 2),
+                "rate": round(self.bucket.rate, 3),
+                "max_rate": self.bucket.max_rate,
+            }
+
+    def _before_sleep(self, retry_state):
+        with self._lock:
+            self.retries += 1
+            self.backoff_seconds += retry_state.next_action.sleep
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def is_throttled(exc):
+    return isinstance(exc, YFRateLimitError) or any(marker in str(exc) for marker in THROTTLE_MARKERS)
+
+
+def is_retryable(exc):
+    # Solo se reintenta lo transitorio: 429 y fallos de conexión; un símbolo inválido falla a la primera
+    return is_throttled(exc) or isinstance(exc, (ConnectionError, TimeoutError, requests.ConnectionError,
+                                                 requests.Timeout))
+
+
+yahoo_throttle = YahooThrottle()
+
+
+def yahoo_call(fn, *args, **kwargs):
+    return yahoo_throttle.call(fn, *args, **kwargs)
+
+
+def throttle_stats():
+    return yahoo_throttle.stats()
@@ -0,0 +1,116 @@
+"""Traducción de descripciones con caché persistente en disco."""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from deep_translator import GoogleTranslator
+from deep_translator import google as google_translator
+
+from financecompare.concurrency import submit_fetch
+from financecompare.session import http_session
+from financecompare.store import atomic_write
+
+# GoogleTranslator no acepta una sesión y llama a ``requests.get`` de su módulo:
+# se le da la sesión compartida para que reutilice conexiones en lugar de abrir una por texto
+google_translator.requests = http_session()
+
+DEFAULT_TRANSLATION_DIR = Path(os.environ.get(
+    "FINANCECOMPARE_TRANSLATION_DIR",
+    Path.home() / ".cache" / "financecompare" / "translations",
+))
+# Longitud máxima del texto que se envía al traductor
+MAX_TRANSLATION_CHARS = 2000
+
+
+class TranslationStore:
+    """Traducciones guardadas por hash del texto original y el idioma destino.
+
+    Cada entrada es un JSON en ``<root>/<2 primeros hex>/<hash>.json``, así una
+    descripción se traduce una sola vez entre sesiones y reinicios.
+    """
+
+    def __init__(self, root=DEFAULT_TRANSLATION_DIR):
+        self.root = Path(root)
+
+    @staticmethod
+    def key(text, target):
+        return hashlib.sha256(f"{target}\0{text}".encode("utf-8")).hexdigest()
+
+    def path(self, text, target):
+        key = self.key(text, target)
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, text, target):
+        path = self.path(text, target)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))["translation"]
+        except (ValueError, KeyError):
+            return None
+
+    def put(self, text, target, translation):
+        path = self.path(text, target)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = json.dumps({"target": target, "translation": translation}, ensure_ascii=False)
+        atomic_write(path, lambda tmp: Path(tmp).write_text(entry, encoding="utf-8"))
+
+
+_default_store = None
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def default_translation_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = TranslationStore()
+    return _default_store
+
+
+def translate_description(text, target="es", store=None):
+    # Devuelve la traducción guardada o traduce y la guarda; si falla, el texto original
+    store = store or default_translation_store()
+    source = text[:MAX_TRANSLATION_CHARS]
+    cached = store.get(source, target)
+    if cached is not None:
+        return cached
+    try:
+        translation = GoogleTranslator(source='auto', target=target).translate(source)
+    except Exception:
+        return text
+    if not translation:
+        return text
+    store.put(source, target, translation)
+    return translation
+
+
+def cached_translation(text, target="es", store=None):
+    # Solo consulta el disco: None si todavía no hay traducción
+    store = store or default_translation_store()
+    return store.get(text[:MAX_TRANSLATION_CHARS], target)
+
+
+def translate_description_async(text, target="es", store=None):
+    """Traduce en el pool de fondo y devuelve un ``Future`` con el resultado.
+
+    Peticiones simultáneas del mismo texto comparten la misma traducción en curso.
+    """
+    key = TranslationStore.key(text[:MAX_TRANSLATION_CHARS], target)
+    with _pending_lock:
+        future = _pending.get(key)
+        if future is not None:
+            return future
+        future = submit_fetch(translate_description, text, target, store)
+        _pending[key] = future
+    # Fuera del lock: si el futuro ya terminó, el callback se ejecuta aquí mismo y toma el lock
+    future.add_done_callback(lambda done: _forget(key, done))
+    return future
+
+
+def _forget(key, future):
+    with _pending_lock:
+        if _pending.get(key) is future:
+            del _pending[key]
@@ -0,0 +1,45 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from financecompare import analytics
+from financecompare.analytics import compare
+from financecompare.prices import price_dates
+
+MONDAY = datetime(2026, 10, 19, 9, 0)
+
+
+def window_as_of(today):
+    # Lo que devolvería Yahoo para la ventana de ``price_dates``: solo días laborables hasta el viernes
+    def load(symbols, years):
+        start, end = price_dates(years, today)
+        index = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=3), name="Date").normalize()
+        growth = np.linspace(1, 2, len(index))[:, None]
+        return pd.DataFrame(100 * growth * np.ones(len(symbols)), index=index, columns=symbols)
+    return load
+
+
+class CompareTest(unittest.TestCase):
+
+    def test_long_periods_are_covered_on_mondays(self):
+        for years in (5, 10, 20):
+            with mock.patch.object(analytics, "load_price_window", window_as_of(MONDAY)):
+                rows = compare(["AAPL", "MSFT"], years)
+            for row in rows:
+                self.assertIsNotNone(row["cagr"], years)
+                self.assertIsNotNone(row["cagr_5y"], years)
+            if years == 5:
+                self.assertEqual(rows[0]["cagr"], rows[0]["cagr_5y"])
+
+    def test_period_window_starts_at_the_same_cutoff_as_the_cagr(self):
+        with mock.patch.object(analytics, "load_price_window", window_as_of(MONDAY)):
+            row = compare(["AAPL"], 10)[0]
+        self.assertEqual(row["last_date"], "2026-10-16")
+        self.assertEqual(row["first_date"], "2016-10-17")
+
+
+if __name__ == "__main__":
+    unittest.main()
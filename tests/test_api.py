@@ -0,0 +1,107 @@
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from financecompare import api
+from financecompare.api import ARROW_MEDIA_TYPE, make_server
+
+
+def fake_window(symbols, years):
+    index = pd.bdate_range("2015-01-01", "2026-10-16", name="Date")
+    growth = np.linspace(1, 2, len(index))[:, None]
+    return pd.DataFrame(100 * growth * np.ones(len(symbols)), index=index, columns=symbols)
+
+
+def fake_profile(symbol):
+    if symbol == "NOPE":
+        raise Exception("404 Client Error: Not Found for url")
+    if symbol == "DOWN":
+        raise ConnectionError("reset by peer")
+    return {"symbol": symbol, "name": symbol, "sector": "Tecnología", "industry": "Software",
+            "country": "US", "description": "Desarrolla software.", "market_cap": 3e12, "currency": "USD"}
+
+
+class ApiTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.patches = [mock.patch("financecompare.analytics.load_price_window", fake_window),
+                       mock.patch.object(api, "load_price_window", fake_window),
+                       mock.patch.object(api.company_info_cache, "_fetch_profile", fake_profile)]
+        for patch in cls.patches:
+            patch.start()
+        cls.server = make_server(port=0)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        for patch in cls.patches:
+            patch.stop()
+
+    def setUp(self):
+        api._responses.clear()
+
+    def get(self, path, headers=None):
+        request = urllib.request.Request(f"http://127.0.0.1:{self.server.server_port}{path}", headers=headers or {})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.headers["Content-Type"], response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers["Content-Type"], e.read()
+
+    def test_compare_and_metrics_return_one_row_per_symbol(self):
+        status, _, body = self.get("/compare?symbols=aapl,MSFT&years=5&horizons=1,3")
+        self.assertEqual(status, 200)
+        rows = json.loads(body)
+        self.assertEqual([row["symbol"] for row in rows], ["AAPL", "MSFT"])
+        self.assertLessEqual({"cagr", "cagr_1y", "cagr_3y", "volatility", "max_drawdown"}, set(rows[0]))
+
+        status, _, body = self.get("/metrics?symbols=AAPL&years=10")
+        self.assertEqual(status, 200)
+        self.assertIsNotNone(json.loads(body)[0]["cagr"])
+
+    def test_arrow_stream_on_request(self):
+        status, content_type, body = self.get("/metrics?symbols=AAPL,MSFT", {"Accept": ARROW_MEDIA_TYPE})
+        self.assertEqual((status, content_type), (200, ARROW_MEDIA_TYPE))
+        table = pa.ipc.open_stream(body).read_all()
+        self.assertEqual(table.column("symbol").to_pylist(), ["AAPL", "MSFT"])
+
+    def test_bad_requests_are_rejected(self):
+        for path in ("/compare", "/metrics?symbols=AAPL&years=0", "/metrics?symbols=AAPL&years=abc",
+                     "/compare?symbols=AAPL&horizons=51"):
+            status, _, body = self.get(path)
+            self.assertEqual(status, 400, path)
+            self.assertIn("error", json.loads(body))
+        self.assertEqual(self.get("/nada")[0], 404)
+
+    def test_info_status_codes(self):
+        status, _, body = self.get("/info/msft")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["symbol"], "MSFT")
+        self.assertEqual(self.get("/info/NOPE")[0], 404)
+        status, _, body = self.get("/info/DOWN")
+        self.assertEqual(status, 502)
+        self.assertIn("reset by peer", json.loads(body)["error"])
+
+    def test_repeated_requests_are_served_from_the_response_cache(self):
+        self.get("/metrics?symbols=AAPL")
+        with mock.patch.object(api, "metrics_rows", side_effect=AssertionError("recalculado")):
+            self.assertEqual(self.get("/metrics?symbols=AAPL")[0], 200)
+
+    def test_health_reports_caches(self):
+        status, _, body = self.get("/health")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["status"], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
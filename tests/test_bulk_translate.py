@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+
+from financecompare.bulk_translate import StubTranslator, translate_universe
+from financecompare.translation import TranslationStore
+
+SUMMARIES = {"AAPL": "Designs smartphones.", "MSFT": "Develops software.", "EMPTY": None}
+
+
+def fake_fetch(symbol):
+    if symbol not in SUMMARIES:
+        raise LookupError(symbol)
+    return SUMMARIES[symbol]
+
+
+class FailingTranslator:
+
+    def translate_batch(self, batch):
+        raise ConnectionError("sin red")
+
+
+class TranslateUniverseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = TranslationStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def translate(self, symbols, translator=None):
+        return translate_universe(symbols, store=self.store, translator=translator or StubTranslator(),
+                                  chunk_size=1, chunk_interval=0, fetch=fake_fetch)
+
+    def test_translates_once_and_then_serves_from_store(self):
+        report = self.translate(["AAPL", "MSFT", "AAPL", "EMPTY", "UNKNOWN"])
+        self.assertEqual(report, {"symbols": 4, "descriptions": 2, "cached": 0, "translated": 2, "failed": 0})
+        self.assertEqual(self.store.get("Designs smartphones.", "es"), "[es] Designs smartphones.")
+
+        report = self.translate(["AAPL", "MSFT"], translator=FailingTranslator())
+        self.assertEqual(report, {"symbols": 2, "descriptions": 2, "cached": 2, "translated": 0, "failed": 0})
+
+    def test_failed_chunks_are_counted_and_not_stored(self):
+        report = self.translate(["AAPL", "MSFT"], translator=FailingTranslator())
+        self.assertEqual(report["failed"], 2)
+        self.assertIsNone(self.store.get("Develops software.", "es"))
+
+
+if __name__ == "__main__":
+    unittest.main()
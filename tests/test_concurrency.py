@@ -0,0 +1,73 @@
+import threading
+import unittest
+
+from financecompare.concurrency import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow(key):
+            calls.append(key)
+            started.set()
+            release.wait(5)
+            return key.lower()
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("AAPL", slow, "AAPL")))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flights.do("AAPL", slow, "AAPL")))
+                     for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        while flights.stats()["coalesced"] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(calls, ["AAPL"])
+        self.assertEqual(results, ["aapl"] * 4)
+        self.assertEqual(flights.stats(), {"in_flight": 0, "executions": 1, "coalesced": 3})
+
+    def test_do_many_only_loads_keys_not_in_flight(self):
+        flights = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        loaded = []
+
+        def load(keys):
+            loaded.append(sorted(keys))
+            if "A" in keys:
+                started.set()
+                release.wait(5)
+            return {key: key * 2 for key in keys}
+
+        first = threading.Thread(target=lambda: flights.do_many(["A"], load))
+        first.start()
+        started.wait(5)
+        threading.Timer(0.05, release.set).start()
+        results = flights.do_many(["A", "B"], load)
+        first.join(5)
+
+        self.assertEqual(results, {"A": "AA", "B": "BB"})
+        self.assertEqual(loaded, [["A"], ["B"]])
+
+    def test_exception_reaches_caller_and_key_is_released(self):
+        flights = SingleFlight()
+
+        def fail():
+            raise ValueError("símbolo inválido")
+
+        with self.assertRaises(ValueError):
+            flights.do("XXX", fail)
+        self.assertEqual(flights.do("XXX", lambda: 1), 1)
+        self.assertEqual(flights.stats()["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from financecompare import framecache
+from financecompare.framecache import PriceFrameCache, frame_nbytes
+
+START = pd.Timestamp("2020-01-01")
+
+
+def series(periods=100):
+    index = pd.bdate_range(START, periods=periods, name="Date")
+    return pd.Series(np.arange(periods, dtype="float64"), index=index)
+
+
+class PriceFrameCacheTest(unittest.TestCase):
+
+    def test_least_recently_used_series_is_evicted_over_budget(self):
+        size = frame_nbytes(series())
+        cache = PriceFrameCache(max_bytes=3 * size)
+        for symbol in ("AAPL", "MSFT", "NVDA"):
+            cache.put(symbol, START, series())
+        cache.get("AAPL", START)
+        cache.put("TSLA", START, series())
+
+        self.assertIsNone(cache.get("MSFT", START))
+        self.assertEqual(list(cache.sizes()), ["TSLA", "AAPL", "NVDA"])
+        self.assertEqual(cache.stats()["bytes"], 3 * size)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_replacing_a_symbol_does_not_leak_bytes(self):
+        cache = PriceFrameCache(max_bytes=10 * frame_nbytes(series(500)))
+        cache.put("AAPL", START, series(100))
+        cache.put("AAPL", START, series(500))
+        self.assertEqual(cache.stats()["bytes"], frame_nbytes(series(500)))
+        self.assertEqual(cache.stats()["entries"], 1)
+
+    def test_series_larger_than_budget_is_not_cached(self):
+        cache = PriceFrameCache(max_bytes=frame_nbytes(series(10)))
+        cache.put("AAPL", START, series(1000))
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_shorter_coverage_and_expired_entries_miss(self):
+        cache = PriceFrameCache(ttl=timedelta(minutes=15))
+        cache.put("AAPL", START, series())
+        self.assertIsNotNone(cache.get("AAPL", START + timedelta(days=30)))
+        self.assertIsNone(cache.get("AAPL", START - timedelta(days=1)))
+        later = framecache.time.monotonic() + 16 * 60
+        with mock.patch.object(framecache.time, "monotonic", return_value=later):
+            self.assertIsNone(cache.get("AAPL", START))
+
+
+if __name__ == "__main__":
+    unittest.main()
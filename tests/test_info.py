@@ -0,0 +1,113 @@
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from financecompare import info
+from financecompare.info import CompanyInfoCache, format_market_cap
+
+
+class FakeYahoo:
+
+    def __init__(self):
+        self.profile_calls = 0
+        self.market_calls = 0
+        self.market_cap = 2e12
+        self.fail = False
+
+    def profile(self, symbol):
+        self.profile_calls += 1
+        if self.fail:
+            raise ConnectionError("sin red")
+        return {"symbol": symbol, "name": f"{symbol} Inc.", "sector": "Tecnología", "industry": "Software",
+                "country": "US", "description": "Desarrolla software.", "market_cap": self.market_cap,
+                "currency": "USD"}
+
+    def market(self, symbol):
+        self.market_calls += 1
+        if self.fail:
+            raise ConnectionError("sin red")
+        return self.market_cap
+
+
+class CompanyInfoCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.yahoo = FakeYahoo()
+        self.submitted = []
+        self.cache = CompanyInfoCache(profile_ttl=timedelta(hours=1), market_ttl=timedelta(minutes=15),
+                                      fetch_profile=self.yahoo.profile, fetch_market=self.yahoo.market,
+                                      submit=lambda fn, *args: self.submitted.append((fn, args)))
+        patcher = mock.patch.object(info, "cached_translation", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def advance(self, seconds):
+        now = time.monotonic() + seconds
+        patcher = mock.patch.object(info.time, "monotonic", return_value=now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_refreshes(self):
+        submitted, self.submitted = self.submitted, []
+        for fn, args in submitted:
+            fn(*args)
+
+    def test_first_request_waits_and_then_hits_memory(self):
+        first = self.cache.get("AAPL")
+        second = self.cache.get("AAPL")
+        self.assertEqual(first, second)
+        self.assertEqual(first["market_cap"], "$2.00T")
+        self.assertEqual(self.yahoo.profile_calls, 1)
+        self.assertEqual(self.submitted, [])
+
+    def test_expired_market_cap_is_served_stale_and_refreshed_in_background(self):
+        self.cache.get("AAPL")
+        self.yahoo.market_cap = 3e12
+        self.advance(16 * 60)
+
+        self.assertEqual(self.cache.get("AAPL")["market_cap"], "$2.00T")
+        # Una sola revalidación en curso por símbolo y grupo
+        self.cache.get("AAPL")
+        self.assertEqual(len(self.submitted), 1)
+        self.run_refreshes()
+
+        self.assertEqual(self.yahoo.market_calls, 1)
+        self.assertEqual(self.yahoo.profile_calls, 1)
+        self.assertEqual(self.cache.get("AAPL")["market_cap"], "$3.00T")
+
+    def test_expired_profile_is_refreshed_in_background(self):
+        self.cache.get("AAPL")
+        self.advance(2 * 3600)
+        self.cache.get("AAPL")
+        self.run_refreshes()
+        self.assertEqual(self.yahoo.profile_calls, 2)
+        self.assertEqual(self.yahoo.market_calls, 0)
+
+    def test_failed_refresh_keeps_serving_the_previous_value(self):
+        self.cache.get("AAPL")
+        self.yahoo.fail = True
+        self.advance(2 * 3600)
+        self.cache.get("AAPL")
+        self.run_refreshes()
+        self.assertEqual(self.cache.get("AAPL")["name"], "AAPL Inc.")
+        # El fallo libera la revalidación: la siguiente consulta vuelve a intentarlo
+        self.assertEqual(len(self.submitted), 1)
+
+    def test_first_request_failure_is_raised(self):
+        self.yahoo.fail = True
+        with self.assertRaises(ConnectionError):
+            self.cache.get("AAPL")
+
+
+class FormatMarketCapTest(unittest.TestCase):
+
+    def test_formats_by_magnitude(self):
+        self.assertEqual(format_market_cap(1.5e12), "$1.50T")
+        self.assertEqual(format_market_cap(2.5e9), "$2.50B")
+        self.assertEqual(format_market_cap(7e6), "$7.00M")
+        self.assertEqual(format_market_cap("N/A"), "N/A")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from financecompare import metrics as metrics_module
+from financecompare.compact import CompactPrices
+from financecompare.metrics import (TRADING_DAYS, DerivedSeries, compute_cagr_horizons, compute_metrics,
+                                    cumulative_frame, metrics_matrix, rolling_volatility)
+
+
+def expected_rolling(series, window):
+    # Referencia: rolling().std() de pandas sobre la serie propia de cada símbolo
+    returns = series.dropna().pct_change().dropna()
+    return (returns.rolling(window).std() * np.sqrt(TRADING_DAYS) * 100).dropna()
+
+
+class RollingVolatilityTest(unittest.TestCase):
+
+    def test_mixed_calendars_match_pandas_per_symbol(self):
+        rng = np.random.default_rng(0)
+        calendar = pd.date_range("2019-01-01", "2024-12-31")
+        # Acción con fines de semana y festivos frente a una cripto que cotiza todos los días
+        stock = pd.Series(100 * np.cumprod(1 + rng.normal(0, 0.01, len(calendar))), index=calendar)
+        stock = stock[stock.index.dayofweek < 5].drop(stock.index[::37], errors="ignore")
+        crypto = pd.Series(100 * np.cumprod(1 + rng.normal(0, 0.03, len(calendar))), index=calendar)
+        crypto.iloc[:300] = np.nan
+        prices = pd.DataFrame({"AAPL": stock, "BTC-USD": crypto})
+
+        rolling = rolling_volatility(prices, [21, 63, 252])
+        for window, frame in rolling.items():
+            for symbol in prices.columns:
+                expected = expected_rolling(prices[symbol], window)
+                got = frame[symbol].dropna()
+                self.assertTrue(got.index.equals(expected.index), (window, symbol))
+                np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+    def test_without_gaps_matches_pandas(self):
+        rng = np.random.default_rng(1)
+        index = pd.bdate_range("2020-01-01", periods=400)
+        prices = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.01, (400, 3)), axis=0),
+                              index=index, columns=["A", "B", "C"])
+        rolling = rolling_volatility(prices, [63])[63]
+        for symbol in prices.columns:
+            expected = expected_rolling(prices[symbol], 63)
+            np.testing.assert_allclose(rolling[symbol].dropna().to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+
+class RiskMetricsTest(unittest.TestCase):
+
+    def test_volatility_and_drawdown_match_pandas(self):
+        rng = np.random.default_rng(2)
+        index = pd.bdate_range("2020-01-01", periods=500)
+        prices = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.01, (500, 2)), axis=0),
+                              index=index, columns=["A", "B"])
+        prices.iloc[:40, 1] = np.nan
+        metrics = compute_metrics(prices, 1)
+        for symbol in prices.columns:
+            series = prices[symbol].dropna()
+            returns = series.pct_change().dropna()
+            cumulative = (1 + returns).cumprod()
+            self.assertAlmostEqual(metrics.loc[symbol, "volatility"], returns.std(ddof=0) * np.sqrt(TRADING_DAYS) * 100)
+            self.assertAlmostEqual(metrics.loc[symbol, "max_drawdown"], ((cumulative / cumulative.cummax() - 1) * 100).min())
+
+
+class CagrTest(unittest.TestCase):
+
+    def test_cagr_is_annualised_by_actual_span_and_nan_when_history_is_short(self):
+        index = pd.bdate_range("2019-10-16", "2024-10-16")
+        listed = index >= pd.Timestamp("2022-10-17")
+        prices = pd.DataFrame({
+            "OLD": np.linspace(100, 200, len(index)),
+            # Cotiza desde hace dos años y duplica su precio: ~41 % anual, no 14,9 % a 5 años
+            "NEW": np.nan,
+        }, index=index)
+        prices.loc[listed, "NEW"] = np.linspace(50, 100, listed.sum())
+
+        metrics = compute_metrics(prices, 5)
+        horizons = compute_cagr_horizons(prices, [2, 5])
+        self.assertAlmostEqual(metrics.loc["OLD", "cagr"], horizons.loc[5, "OLD"])
+        self.assertTrue(np.isnan(metrics.loc["NEW", "cagr"]))
+        self.assertGreater(horizons.loc[2, "NEW"], 40)
+
+
+class DerivedSeriesTest(unittest.TestCase):
+
+    def test_metrics_and_charts_share_one_pass_over_the_returns(self):
+        rng = np.random.default_rng(4)
+        index = pd.bdate_range("2020-01-01", periods=300)
+        prices = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.01, (300, 2)), axis=0),
+                              index=index, columns=["A", "B"])
+        prices.iloc[:40, 1] = np.nan
+        expected = (compute_metrics(prices, 1), cumulative_frame(prices), rolling_volatility(prices, [21])[21])
+
+        derived = DerivedSeries(prices)
+        with mock.patch.object(metrics_module, "returns_matrix", wraps=metrics_module.returns_matrix) as returns:
+            got = (compute_metrics(prices, 1, derived=derived), cumulative_frame(prices, derived=derived),
+                   rolling_volatility(prices, [21], derived=derived)[21])
+        self.assertEqual(returns.call_count, 1)
+        for frame, reference in zip(got, expected):
+            pd.testing.assert_frame_equal(frame, reference)
+
+
+class CompactPricesTest(unittest.TestCase):
+
+    def test_metrics_accept_compact_prices(self):
+        rng = np.random.default_rng(3)
+        index = pd.bdate_range("2018-01-01", periods=1500)
+        prices = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.01, (1500, 3)), axis=0),
+                              index=index, columns=["A", "B", "C"]).astype("float32")
+        compact = CompactPrices.from_frame(prices)
+
+        pd.testing.assert_frame_equal(compute_metrics(compact, 5), compute_metrics(prices, 5))
+        np.testing.assert_allclose(metrics_matrix(compact, 5)["volatility"],
+                                   compute_metrics(prices, 5)["volatility"].to_numpy())
+        self.assertIs(np.asarray(compact), compact.closes)
+
+
+if __name__ == "__main__":
+    unittest.main()
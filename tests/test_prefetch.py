@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from financecompare.prefetch import WEEKDAYS, fresh_until, next_run, parse_times
+from financecompare.prices import REFRESH_INTERVAL
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+class NextRunTest(unittest.TestCase):
+
+    def test_later_time_on_the_same_day(self):
+        now = datetime(2026, 10, 14, 16, 45, tzinfo=NEW_YORK)  # miércoles
+        times = parse_times(["17:15", "16:30"])
+        self.assertEqual(times, [(16, 30), (17, 15)])
+        self.assertEqual(next_run(now, times), datetime(2026, 10, 14, 17, 15, tzinfo=NEW_YORK))
+
+    def test_exact_time_moves_to_the_next_run(self):
+        now = datetime(2026, 10, 14, 16, 30, tzinfo=NEW_YORK)
+        self.assertEqual(next_run(now, [(16, 30)]), datetime(2026, 10, 15, 16, 30, tzinfo=NEW_YORK))
+
+    def test_weekends_are_skipped_unless_every_day(self):
+        friday_evening = datetime(2026, 10, 16, 18, 0, tzinfo=NEW_YORK)
+        self.assertEqual(next_run(friday_evening, [(16, 30)], WEEKDAYS),
+                         datetime(2026, 10, 19, 16, 30, tzinfo=NEW_YORK))
+        self.assertEqual(next_run(friday_evening, [(16, 30)], range(7)),
+                         datetime(2026, 10, 17, 16, 30, tzinfo=NEW_YORK))
+
+    def test_keeps_local_time_across_daylight_saving_change(self):
+        # El 1 de noviembre de 2026 Nueva York vuelve a EST
+        before = datetime(2026, 10, 30, 17, 0, tzinfo=NEW_YORK)
+        run = next_run(before, [(16, 30)])
+        self.assertEqual((run.month, run.day, run.hour, run.minute), (11, 2, 16, 30))
+        self.assertEqual(run.utcoffset().total_seconds(), -5 * 3600)
+
+    def test_empty_schedule_is_an_error(self):
+        with self.assertRaises(ValueError):
+            next_run(datetime(2026, 10, 14, tzinfo=NEW_YORK), [(16, 30)], days=[])
+
+
+
+class FreshUntilTest(unittest.TestCase):
+
+    def local(self, moment):
+        return moment.astimezone().replace(tzinfo=None)
+
+    def test_after_the_close_prices_stay_valid_until_the_next_open(self):
+        friday_close = datetime(2026, 10, 16, 16, 30, tzinfo=NEW_YORK)
+        self.assertEqual(fresh_until(friday_close), self.local(datetime(2026, 10, 19, 9, 30, tzinfo=NEW_YORK)))
+        early = datetime(2026, 10, 14, 6, 0, tzinfo=NEW_YORK)
+        self.assertEqual(fresh_until(early), self.local(datetime(2026, 10, 14, 9, 30, tzinfo=NEW_YORK)))
+
+    def test_during_the_session_the_normal_interval_applies(self):
+        midday = datetime(2026, 10, 14, 12, 0, tzinfo=NEW_YORK)
+        self.assertEqual(fresh_until(midday), self.local(midday) + REFRESH_INTERVAL)
+
+
+if __name__ == "__main__":
+    unittest.main()
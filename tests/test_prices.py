@@ -0,0 +1,121 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from financecompare import prices
+from financecompare.prices import load_prices, load_prices_batch
+from financecompare.store import PriceStore
+
+
+class FakeYahoo:
+    """Serie de cierres 'remota' que registra cada tramo pedido."""
+
+    def __init__(self, history):
+        self.history = history.copy()
+        self.calls = []
+
+    def fetch(self, symbol, start, end):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        return self.history.loc[start:pd.Timestamp(end) - timedelta(days=1)]
+
+
+class LoadPricesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = PriceStore(self.tmp.name)
+        index = pd.bdate_range("2016-10-19", "2026-10-16", name="Date")
+        self.history = pd.DataFrame({"Close": 100 + np.arange(len(index), dtype="float64")}, index=index)
+        self.covered_from = pd.Timestamp("2016-10-19")
+        self.end = pd.Timestamp("2026-10-17")
+        # Guardado hace dos horas, durante la sesión: la última barra es la barra en vivo
+        checked_at = datetime.now() - timedelta(hours=2)
+        self.store.write("AAPL", self.history, {"covered_from": self.covered_from.isoformat(),
+                                                "checked_at": checked_at.isoformat()})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_moved_live_bar_is_overwritten_without_full_reload(self):
+        remote = self.history.copy()
+        remote.iloc[-1, 0] += 0.7
+        yahoo = FakeYahoo(remote)
+
+        loaded = load_prices("AAPL", self.covered_from, self.end, store=self.store, fetch=yahoo.fetch)
+
+        self.assertEqual(yahoo.calls, [(self.history.index[-2], self.end)])
+        self.assertEqual(loaded["Close"].iloc[-1], remote["Close"].iloc[-1])
+        self.assertEqual(self.store.read("AAPL")["Close"].iloc[-1], remote["Close"].iloc[-1])
+        self.assertEqual(len(list(self.store.symbol_dir("AAPL").glob(PriceStore.DELTA_GLOB))), 1)
+
+    def test_new_bars_are_appended(self):
+        index = pd.bdate_range(self.history.index[0], "2026-10-20", name="Date")
+        remote = pd.DataFrame({"Close": 100 + np.arange(len(index), dtype="float64")}, index=index)
+        yahoo = FakeYahoo(remote)
+
+        end = pd.Timestamp("2026-10-21")
+        loaded = load_prices("AAPL", self.covered_from, end, store=self.store, fetch=yahoo.fetch)
+
+        self.assertEqual(len(yahoo.calls), 1)
+        pd.testing.assert_frame_equal(loaded, remote, check_freq=False)
+
+    def test_restated_close_reloads_full_history(self):
+        remote = self.history.copy()
+        remote.iloc[-2, 0] /= 2
+        yahoo = FakeYahoo(remote)
+
+        load_prices("AAPL", self.covered_from, self.end, store=self.store, fetch=yahoo.fetch)
+
+        self.assertEqual(yahoo.calls, [(self.history.index[-2], self.end), (self.covered_from, self.end)])
+        self.assertEqual(self.store.read("AAPL")["Close"].iloc[-2], remote["Close"].iloc[-2])
+
+    def test_recent_check_serves_store_without_fetching(self):
+        self.store.write_meta("AAPL", {"covered_from": self.covered_from.isoformat(),
+                                       "checked_at": datetime.now().isoformat()})
+        yahoo = FakeYahoo(self.history)
+        load_prices("AAPL", self.covered_from, self.end, store=self.store, fetch=yahoo.fetch)
+        self.assertEqual(yahoo.calls, [])
+
+    def test_prefetched_check_stays_valid_until_fresh_until(self):
+        yahoo = FakeYahoo(self.history)
+        tomorrow_open = datetime.now() + timedelta(hours=14)
+        load_prices("AAPL", self.covered_from, self.end, store=self.store, fetch=yahoo.fetch,
+                    fresh_until=tomorrow_open)
+        # El pre-calentado siempre pregunta, aunque la última comprobación sea reciente
+        self.assertEqual(len(yahoo.calls), 1)
+        self.assertEqual(self.store.read_meta("AAPL")["fresh_until"], tomorrow_open.isoformat())
+
+        meta = self.store.read_meta("AAPL")
+        meta["checked_at"] = (datetime.now() - timedelta(hours=10)).isoformat()
+        self.store.write_meta("AAPL", meta)
+        load_prices("AAPL", self.covered_from, self.end, store=self.store, fetch=yahoo.fetch)
+        self.assertEqual(len(yahoo.calls), 1)
+
+        meta["fresh_until"] = (datetime.now() - timedelta(minutes=1)).isoformat()
+        self.store.write_meta("AAPL", meta)
+        load_prices("AAPL", self.covered_from, self.end, store=self.store, fetch=yahoo.fetch)
+        self.assertEqual(len(yahoo.calls), 2)
+
+    def test_batch_refresh_covers_the_provisional_bar(self):
+        remote = self.history.copy()
+        remote.iloc[-1, 0] += 0.7
+        downloads = []
+
+        def download(symbols, start, end):
+            downloads.append((list(symbols), pd.Timestamp(start)))
+            return remote.loc[start:].rename(columns={"Close": symbols[0]})
+
+        with mock.patch.object(prices, "download_prices_batch", download), \
+                mock.patch.object(prices, "download_prices", side_effect=AssertionError("descarga individual")):
+            wide = load_prices_batch(["AAPL"], self.covered_from, self.end, store=self.store)
+
+        self.assertEqual(downloads, [(["AAPL"], self.history.index[-2])])
+        self.assertEqual(wide["AAPL"].iloc[-1], remote["Close"].iloc[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from financecompare.compact import CompactPrices
+from financecompare.shared import CURRENT_FILE, KEEP_VERSIONS, SharedPriceMatrix, publish_matrix
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 7, 2)
+
+
+def compact(end=END):
+    index = pd.bdate_range(START, pd.Timestamp(end) - timedelta(days=1), name="Date")
+    frame = pd.DataFrame(np.arange(len(index) * 2, dtype="float64").reshape(-1, 2) + 1,
+                         index=index, columns=["AAPL", "MSFT"])
+    return CompactPrices.from_frame(frame)
+
+
+class SharedPriceMatrixTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.matrix = SharedPriceMatrix(self.root)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_published_window_is_served_from_the_mapped_files(self):
+        publish_matrix(compact(), self.root, END)
+        wide = self.matrix.get(["MSFT"], START, END)
+        self.assertEqual(list(wide.columns), ["MSFT"])
+        self.assertEqual(wide.index[-1], pd.Timestamp("2024-07-01"))
+        self.assertEqual(wide.dtypes["MSFT"], np.float64)
+        # Vista de solo lectura sobre el archivo mapeado, no una copia
+        closes = self.matrix.load().closes
+        self.assertFalse(closes.flags.owndata)
+        self.assertFalse(closes.flags.writeable)
+
+    def test_missing_symbols_or_uncovered_dates_fall_back(self):
+        publish_matrix(compact(), self.root, END)
+        self.assertIsNone(self.matrix.get(["AAPL", "NVDA"], START, END))
+        self.assertIsNone(self.matrix.get(["AAPL"], START - timedelta(days=30), END))
+        # La publicación termina antes de lo pedido: faltan las barras de hoy
+        self.assertIsNone(self.matrix.get(["AAPL"], START, END + timedelta(days=1)))
+
+    def test_publication_without_end_date_covers_its_last_bar(self):
+        publish_matrix(compact(), self.root)
+        self.assertIsNotNone(self.matrix.get(["AAPL"], START, END))
+        self.assertIsNone(self.matrix.get(["AAPL"], START, END + timedelta(days=1)))
+
+    def test_stale_publication_is_ignored(self):
+        directory = publish_matrix(compact(), self.root, END)
+        meta = json.loads((directory / "meta.json").read_text())
+        meta["published_at"] = (datetime.now() - timedelta(hours=2)).isoformat()
+        (directory / "meta.json").write_text(json.dumps(meta))
+        self.assertIsNone(SharedPriceMatrix(self.root, max_age=timedelta(hours=1)).get(["AAPL"], START, END))
+        self.assertIsNotNone(SharedPriceMatrix(self.root, max_age=timedelta(hours=3)).get(["AAPL"], START, END))
+
+    def test_new_version_is_picked_up_and_old_ones_pruned(self):
+        publish_matrix(compact(), self.root, END)
+        self.matrix.get(["AAPL"], START, END)
+        for _ in range(KEEP_VERSIONS + 1):
+            latest = publish_matrix(compact(END + timedelta(days=7)), self.root, END + timedelta(days=7))
+        self.assertEqual((self.root / CURRENT_FILE).read_text(), latest.name)
+        self.assertEqual(len(list(self.root.glob("v*"))), KEEP_VERSIONS)
+        self.assertIsNotNone(self.matrix.get(["AAPL"], START, END + timedelta(days=7)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financecompare.store import PriceStore, normalize_close
+
+
+def closes(start, periods, first=100.0):
+    index = pd.bdate_range(start, periods=periods, name="Date")
+    return pd.DataFrame({"Close": first + np.arange(periods, dtype="float64")}, index=index)
+
+
+class PriceStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = PriceStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def deltas(self, symbol):
+        return list(self.store.symbol_dir(symbol).glob(PriceStore.DELTA_GLOB))
+
+    def test_write_and_read_round_trip(self):
+        history = closes("2024-01-01", 10)
+        meta = {"covered_from": "2024-01-01", "checked_at": "2024-01-12T18:00:00"}
+        self.store.write("BRK-B", history, meta)
+
+        pd.testing.assert_frame_equal(self.store.read("BRK-B"), history, check_freq=False)
+        self.assertEqual(self.store.read_meta("brk-b"), meta)
+        # Otro proceso con el mismo directorio lee lo mismo
+        pd.testing.assert_frame_equal(PriceStore(self.tmp.name).read("BRK-B"), history, check_freq=False)
+
+    def test_missing_symbol_and_corrupt_meta(self):
+        self.assertIsNone(self.store.read("MSFT"))
+        self.assertEqual(self.store.read_meta("MSFT"), {})
+        self.store.write("MSFT", closes("2024-01-01", 2), {})
+        (self.store.symbol_dir("MSFT") / PriceStore.META_FILE).write_text("{")
+        self.assertEqual(self.store.read_meta("MSFT"), {})
+
+    def test_symbols_with_special_characters_get_their_own_directory(self):
+        self.store.write("^GSPC", closes("2024-01-01", 3), {})
+        self.store.write("EURUSD=X", closes("2024-01-01", 4), {})
+        self.assertEqual(len(self.store.read("^GSPC")), 3)
+        self.assertEqual(len(self.store.read("EURUSD=X")), 4)
+
+    def test_normalize_close_drops_timezone_and_duplicates(self):
+        index = pd.DatetimeIndex(["2024-01-02 09:30", "2024-01-03 09:30", "2024-01-03 16:00"],
+                                 tz="America/New_York")
+        frame = normalize_close(pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index))
+        self.assertIsNone(frame.index.tz)
+        self.assertEqual(frame.index.tolist(), [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")])
+        self.assertEqual(frame["Close"].tolist(), [1.0, 3.0])
+
+    def test_append_adds_deltas_and_read_merges_them(self):
+        base = closes("2024-01-01", 10)
+        self.store.write("AAPL", base, {"covered_from": "2024-01-01"})
+        tail = closes("2024-01-15", 3, first=200.0)
+        self.store.append("AAPL", tail, {"covered_from": "2024-01-01", "checked_at": "2024-01-17T18:00:00"})
+
+        self.assertEqual(len(self.deltas("AAPL")), 1)
+        pd.testing.assert_frame_equal(self.store.read("AAPL"), pd.concat([base, tail]), check_freq=False)
+        self.assertEqual(self.store.read_meta("AAPL")["checked_at"], "2024-01-17T18:00:00")
+
+    def test_append_compacts_after_too_many_deltas(self):
+        self.store.COMPACT_AFTER = 3
+        self.store.write("MSFT", closes("2024-01-01", 5), {})
+        for i in range(3):
+            self.store.append("MSFT", closes(pd.Timestamp("2024-02-01") + pd.offsets.BDay(i), 1, first=i), {})
+
+        self.assertEqual(self.deltas("MSFT"), [])
+        history = self.store.read("MSFT")
+        self.assertEqual(len(history), 8)
+        self.assertEqual(history["Close"].iloc[-3:].tolist(), [0.0, 1.0, 2.0])
+
+    def test_write_replaces_history_and_drops_deltas(self):
+        self.store.write("NVDA", closes("2024-01-01", 5), {})
+        self.store.append("NVDA", closes("2024-01-08", 1), {})
+        replaced = closes("2023-06-01", 3)
+        self.store.write("NVDA", replaced, {})
+
+        self.assertEqual(self.deltas("NVDA"), [])
+        pd.testing.assert_frame_equal(self.store.read("NVDA"), replaced, check_freq=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
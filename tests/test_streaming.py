@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from financecompare.metrics import compute_metrics
+from financecompare.streaming import StreamingMetrics
+
+
+def prices_with_gaps():
+    rng = np.random.default_rng(5)
+    index = pd.bdate_range("2021-01-01", periods=500)
+    prices = pd.DataFrame(100 * np.cumprod(1 + rng.normal(0, 0.02, (500, 3)), axis=0),
+                          index=index, columns=["AAPL", "BTC-USD", "NEW"])
+    prices.iloc[::9, 0] = np.nan
+    prices.iloc[:200, 2] = np.nan
+    return prices
+
+
+class StreamingMetricsTest(unittest.TestCase):
+
+    def assert_matches_batch(self, state, prices):
+        expected = compute_metrics(prices, 1)
+        np.testing.assert_allclose(state.volatility, expected["volatility"].to_numpy(), rtol=1e-9)
+        np.testing.assert_allclose(state.max_drawdown, expected["max_drawdown"].to_numpy(), rtol=1e-9)
+
+    def test_bar_by_bar_updates_match_batch_metrics(self):
+        prices = prices_with_gaps()
+        state = StreamingMetrics(prices.shape[1])
+        for row in prices.to_numpy():
+            state.update(row)
+        self.assert_matches_batch(state, prices)
+
+    def test_history_then_updates_match_batch_metrics(self):
+        prices = prices_with_gaps()
+        state = StreamingMetrics.from_history(prices.iloc[:300])
+        self.assert_matches_batch(state, prices.iloc[:300])
+        for row in prices.iloc[300:].to_numpy():
+            state.update(row)
+        self.assert_matches_batch(state, prices)
+
+    def test_symbol_without_returns_stays_nan(self):
+        state = StreamingMetrics(2)
+        state.update([100.0, np.nan])
+        state.update([101.0, 50.0])
+        self.assertTrue(np.isnan(state.volatility[1]))
+        self.assertTrue(np.isnan(state.max_drawdown[1]))
+        self.assertEqual(state.max_drawdown[0], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from unittest import mock
+
+import pandas as pd
+from yfinance.exceptions import YFRateLimitError
+
+from financecompare import prices
+from financecompare.throttle import TokenBucket, YahooThrottle
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_burst_is_free_and_then_calls_wait_for_the_rate(self):
+        bucket = TokenBucket(rate=200, burst=3)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        delay = bucket.acquire()
+        self.assertGreater(delay, 0)
+        self.assertLessEqual(delay, 1 / 200)
+        self.assertEqual(bucket.waits, 1)
+
+    def test_slow_down_halves_the_rate_down_to_the_floor_and_recover_restores_it(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        for _ in range(10):
+            bucket.slow_down()
+        self.assertAlmostEqual(bucket.rate, 1.0)
+        for _ in range(100):
+            bucket.recover()
+        self.assertEqual(bucket.rate, 10)
+
+
+class YahooThrottleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sleeps = []
+        self.throttle = YahooThrottle(TokenBucket(rate=1000, burst=1000), max_attempts=3,
+                                      sleep=self.sleeps.append)
+
+    def test_rate_limited_calls_are_retried_with_backoff(self):
+        answers = [YFRateLimitError(), YFRateLimitError(), "ok"]
+
+        def call():
+            answer = answers.pop(0)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        self.assertEqual(self.throttle.call(call), "ok")
+        stats = self.throttle.stats()
+        self.assertEqual((stats["calls"], stats["throttled"], stats["retries"]), (3, 2, 2))
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_other_errors_fail_without_retrying(self):
+        def call():
+            raise ValueError("símbolo inválido")
+
+        with self.assertRaises(ValueError):
+            self.throttle.call(call)
+        stats = self.throttle.stats()
+        self.assertEqual((stats["calls"], stats["retries"], stats["failures"]), (1, 0, 1))
+
+
+
+class BatchDownloadTest(unittest.TestCase):
+
+    def test_batches_are_split_to_fit_the_burst(self):
+        calls = []
+
+        def fake_call(fn, symbols, start, end, tokens=1):
+            calls.append((list(symbols), tokens))
+            index = pd.bdate_range("2024-01-01", periods=3, name="Date")
+            columns = pd.MultiIndex.from_product([["Close"], symbols])
+            return pd.DataFrame(1.0, index=index, columns=columns)
+
+        throttle = YahooThrottle(TokenBucket(rate=2, burst=5))
+        symbols = [f"S{i}" for i in range(12)]
+        with mock.patch.object(prices, "yahoo_throttle", throttle), mock.patch.object(prices, "yahoo_call", fake_call):
+            wide = prices.download_prices_batch(symbols, "2024-01-01", "2024-01-04")
+
+        self.assertEqual([len(chunk) for chunk, _ in calls], [5, 5, 2])
+        self.assertEqual([tokens for _, tokens in calls], [5, 5, 2])
+        self.assertEqual(list(wide.columns), symbols)
+        self.assertEqual(wide.shape, (3, 12))
+
+
+if __name__ == "__main__":
+    unittest.main()
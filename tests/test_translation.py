@@ -0,0 +1,100 @@
+import tempfile
+import threading
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+from financecompare import translation
+from financecompare.translation import (MAX_TRANSLATION_CHARS, TranslationStore, cached_translation,
+                                        translate_description, translate_description_async)
+
+
+def finished(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class TranslationStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = TranslationStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_and_get_by_text_and_target(self):
+        self.assertIsNone(self.store.get("Designs smartphones.", "es"))
+        self.store.put("Designs smartphones.", "es", "Diseña teléfonos.")
+        self.assertEqual(self.store.get("Designs smartphones.", "es"), "Diseña teléfonos.")
+        self.assertIsNone(self.store.get("Designs smartphones.", "fr"))
+        # Otro proceso con el mismo directorio ve la misma traducción
+        self.assertEqual(TranslationStore(self.tmp.name).get("Designs smartphones.", "es"), "Diseña teléfonos.")
+
+    def test_corrupt_entry_reads_as_missing(self):
+        path = self.store.path("texto", "es")
+        path.parent.mkdir(parents=True)
+        path.write_text("{", encoding="utf-8")
+        self.assertIsNone(self.store.get("texto", "es"))
+
+
+class TranslateDescriptionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = TranslationStore(self.tmp.name)
+        self.translator = mock.MagicMock()
+        patcher = mock.patch.object(translation, "GoogleTranslator", return_value=self.translator)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_translates_once_and_then_reads_the_store(self):
+        self.translator.translate.return_value = "Desarrolla software."
+        self.assertEqual(translate_description("Develops software.", store=self.store), "Desarrolla software.")
+        self.assertEqual(translate_description("Develops software.", store=self.store), "Desarrolla software.")
+        self.assertEqual(self.translator.translate.call_count, 1)
+        self.assertEqual(cached_translation("Develops software.", store=self.store), "Desarrolla software.")
+
+    def test_long_texts_are_truncated_before_translating(self):
+        self.translator.translate.side_effect = lambda text: text.upper()
+        text = "a" * (MAX_TRANSLATION_CHARS + 500)
+        self.assertEqual(len(translate_description(text, store=self.store)), MAX_TRANSLATION_CHARS)
+        self.assertIsNotNone(cached_translation(text, store=self.store))
+
+    def test_failure_returns_the_original_and_is_not_stored(self):
+        self.translator.translate.side_effect = ConnectionError("sin red")
+        self.assertEqual(translate_description("Develops software.", store=self.store), "Develops software.")
+        self.assertIsNone(cached_translation("Develops software.", store=self.store))
+
+
+
+class TranslateAsyncTest(unittest.TestCase):
+
+    def test_future_already_done_does_not_deadlock(self):
+        # Acierto en disco o fallo inmediato: el futuro termina antes de registrar el callback
+        with mock.patch.object(translation, "submit_fetch", lambda fn, *args: finished("traducido")):
+            results = []
+            caller = threading.Thread(target=lambda: results.append(
+                translate_description_async("ya traducido").result()), daemon=True)
+            caller.start()
+            caller.join(5)
+        self.assertFalse(caller.is_alive(), "translate_description_async se bloqueó")
+        self.assertEqual(results, ["traducido"])
+        self.assertEqual(translation._pending, {})
+
+    def test_concurrent_requests_share_the_pending_translation(self):
+        pending = Future()
+        with mock.patch.object(translation, "submit_fetch", lambda fn, *args: pending):
+            first = translate_description_async("texto largo")
+            second = translate_description_async("texto largo")
+        self.assertIs(first, second)
+        pending.set_result("traducido")
+        self.assertEqual(translation._pending, {})
+
+
+if __name__ == "__main__":
+    unittest.main()